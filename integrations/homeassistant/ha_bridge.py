@@ -179,7 +179,9 @@ class HAWebSocketManager:
         self._session: Optional[aiohttp.ClientSession] = None
         self._msg_id = 1
         self._subscriptions: Dict[int, Callable] = {}
+        self._pending: Dict[int, asyncio.Future] = {}
         self._event_callbacks: List[Callable] = []
+        self._authenticated = False
         self._running = False
         self._task: Optional[asyncio.Task] = None
         self._reconnect_delay = WS_RECONNECT_DELAY
@@ -187,6 +189,11 @@ class HAWebSocketManager:
     def add_event_callback(self, callback: Callable):
         self._event_callbacks.append(callback)
 
+    @property
+    def connected(self) -> bool:
+        """True once the socket is open and the auth handshake has completed."""
+        return self._authenticated and self._ws is not None and not self._ws.closed
+
     async def start(self):
         self._running = True
         self._task = asyncio.create_task(self._run_loop())
@@ -216,7 +223,9 @@ class HAWebSocketManager:
     async def _connect_and_listen(self):
         session = aiohttp.ClientSession()
         try:
-            async with session.ws_connect(self._url, heartbeat=30) as ws:
+            # compress=15 negotiates permessage-deflate — get_states payloads
+            # are hundreds of KB of highly repetitive JSON.
+            async with session.ws_connect(self._url, heartbeat=30, compress=15) as ws:
                 self._ws = ws
                 logger.info(f"WebSocket connected to {self._url}")
                 self._reconnect_delay = WS_RECONNECT_DELAY
@@ -229,6 +238,7 @@ class HAWebSocketManager:
                 auth_ok = await ws.receive_json()
                 if auth_ok.get("type") != "auth_ok":
                     raise PermissionError(f"WebSocket auth failed: {auth_ok}")
+                self._authenticated = True
 
                 # Subscribe to all state_changed events
                 sub_id = self._msg_id
@@ -246,11 +256,26 @@ class HAWebSocketManager:
                     elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
                         break
         finally:
+            self._authenticated = False
+            self._fail_pending(ConnectionError("WebSocket disconnected"))
             await session.close()
 
+    def _fail_pending(self, exc: Exception):
+        pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(exc)
+
     async def _handle_message(self, data: dict):
         msg_type = data.get("type")
-        if msg_type == "event":
+        if msg_type == "result":
+            fut = self._pending.pop(data.get("id"), None)
+            if fut and not fut.done():
+                if data.get("success"):
+                    fut.set_result(data.get("result"))
+                else:
+                    fut.set_exception(RuntimeError(f"WebSocket command failed: {data.get('error')}"))
+        elif msg_type == "event":
             event = data.get("event", {})
             event_type = event.get("event_type")
             event_data = event.get("data", {})
@@ -280,6 +305,22 @@ class HAWebSocketManager:
         await self._ws.send_json(message)
         return msg_id
 
+    async def request(self, message: dict, timeout: float = REQUEST_TIMEOUT) -> Any:
+        """
+        Send a command over the open socket and await its ``result`` payload.
+        Reuses the authenticated connection — no new TCP/TLS handshake or re-auth.
+        """
+        if not self.connected:
+            raise ConnectionError("WebSocket not connected")
+        fut = asyncio.get_running_loop().create_future()
+        msg_id = self._msg_id
+        self._pending[msg_id] = fut
+        try:
+            await self.send(message)
+            return await asyncio.wait_for(fut, timeout)
+        finally:
+            self._pending.pop(msg_id, None)
+
 
 # ---------------------------------------------------------------------------
 # Main HA Client
@@ -357,6 +398,7 @@ class HAClient:
         headers = {
             "Authorization": f"Bearer {self._token}",
             "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate",
         }
         connector = aiohttp.TCPConnector(limit=20)
         timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
@@ -437,11 +479,21 @@ class HAClient:
         """
         Fetch all entity states from Home Assistant.
         Results are cached for DEFAULT_CACHE_TTL seconds.
+
+        Prefers the already-open WebSocket (``get_states`` command, deflate
+        compressed); falls back to the gzip-encoded REST endpoint.
         """
         cached = self._cache.get_all()
         if cached:
             return cached
-        data = await self._get("/api/states")
+        data = None
+        if self._ws_manager and self._ws_manager.connected:
+            try:
+                data = await self._ws_manager.request({"type": "get_states"})
+            except Exception as exc:
+                logger.debug(f"WebSocket get_states failed, falling back to REST: {exc}")
+        if data is None:
+            data = await self._get("/api/states")
         states = [HAState.from_dict(s) for s in data]
         self._cache.set_all(states)
         logger.debug(f"Fetched {len(states)} entity states")
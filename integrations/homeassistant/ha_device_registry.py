@@ -100,6 +100,14 @@ VENDOR_SIGNATURES = {
     },
 }
 
+# Integration ID is authoritative (HA classifies by it) — exact-match index
+# consulted before the keyword heuristics in _detect_vendor.
+_INTEGRATION_TO_VENDOR: Dict[str, str] = {
+    intg: vendor
+    for vendor, rules in VENDOR_SIGNATURES.items()
+    for intg in rules["integration_ids"]
+}
+
 # Room/location keywords for entity placement
 ROOM_KEYWORDS = {
     "living_room": ["living", "lounge", "family", "great_room"],
@@ -213,6 +221,13 @@ class DeviceRegistry:
         self._refresh_interval = refresh_interval
         self._devices: Dict[str, DeviceEntry] = {}
         self._areas: Dict[str, str] = {}           # area_id → area_name
+        # Grouping indexes rebuilt by _reindex(); keys kept pre-sorted for reports
+        self._by_vendor: Dict[str, List[DeviceEntry]] = {}
+        self._by_room: Dict[str, List[DeviceEntry]] = {}    # room lists sorted by category
+        self._by_category: Dict[str, List[DeviceEntry]] = {}
+        self._by_vendor_keys_sorted: tuple = ()
+        self._by_room_keys_sorted: tuple = ()
+        self._by_category_keys_sorted: tuple = ()
         self._last_refresh: float = 0.0
         self._refresh_task: Optional[asyncio.Task] = None
         self._running = False
@@ -251,11 +266,17 @@ class DeviceRegistry:
         """
         logger.info("Refreshing device registry...")
         try:
-            # Fetch entity states
-            states = await self._ha.get_states()
-
-            # Try to get area registry
-            await self._fetch_areas()
+            # Fetch entity states and the area registry concurrently — they hit
+            # independent HA endpoints. A failed area fetch must not abort the refresh.
+            states, areas_result = await asyncio.gather(
+                self._ha.get_states(),
+                self._fetch_areas(),
+                return_exceptions=True,
+            )
+            if isinstance(states, BaseException):
+                raise states
+            if isinstance(areas_result, BaseException):
+                logger.debug(f"Area registry fetch failed: {areas_result}")
 
             # Rebuild device map
             new_devices: Dict[str, DeviceEntry] = {}
@@ -264,6 +285,7 @@ class DeviceRegistry:
                 new_devices[entry.entity_id] = entry
 
             self._devices = new_devices
+            self._reindex()
             self._last_refresh = time.time()
             self._save_cache()
             logger.info(f"Registry refreshed: {len(self._devices)} entities")
@@ -272,6 +294,25 @@ class DeviceRegistry:
             logger.error(f"Registry refresh failed: {exc}")
             raise
 
+    def _reindex(self):
+        """Rebuild the vendor/room/category groupings and their sorted key orders."""
+        by_vendor: Dict[str, List[DeviceEntry]] = {}
+        by_room: Dict[str, List[DeviceEntry]] = {}
+        by_category: Dict[str, List[DeviceEntry]] = {}
+        for d in self._devices.values():
+            by_vendor.setdefault(d.vendor, []).append(d)
+            by_room.setdefault(d.room or "Unassigned", []).append(d)
+            by_category.setdefault(d.category, []).append(d)
+        for entries in by_room.values():
+            entries.sort(key=lambda e: e.category)
+
+        self._by_vendor = by_vendor
+        self._by_room = by_room
+        self._by_category = by_category
+        self._by_vendor_keys_sorted = tuple(sorted(by_vendor))
+        self._by_room_keys_sorted = tuple(sorted(by_room))
+        self._by_category_keys_sorted = tuple(sorted(by_category))
+
     async def _fetch_areas(self):
         """Fetch area (room) assignments from HA."""
         try:
@@ -329,8 +370,11 @@ class DeviceRegistry:
 
     def _detect_vendor(self, entity_id: str, attrs: dict) -> str:
         """Classify an entity's vendor based on entity_id, attributes, and integration."""
-        entity_lower = entity_id.lower()
         integration = str(attrs.get("integration", "")).lower()
+        if integration and (vendor := _INTEGRATION_TO_VENDOR.get(integration)):
+            return vendor
+
+        entity_lower = entity_id.lower()
         model = str(attrs.get("model", "")).lower()
         manufacturer = str(attrs.get("manufacturer", "")).lower()
         friendly = str(attrs.get("friendly_name", "")).lower()
@@ -398,7 +442,7 @@ class DeviceRegistry:
 
     def get_by_vendor(self, vendor: str) -> List[DeviceEntry]:
         """Get all devices for a specific vendor."""
-        return [d for d in self._devices.values() if d.vendor == vendor]
+        return list(self._by_vendor.get(vendor, ()))
 
     def get_by_domain(self, domain: str) -> List[DeviceEntry]:
         """Get all entities of a specific domain (light, switch, camera, etc.)."""
@@ -474,37 +518,23 @@ class DeviceRegistry:
         Returns:
             Dict suitable for JSON export or Bob's system awareness.
         """
-        devices = list(self._devices.values())
-
-        # --- By vendor ---
-        by_vendor: Dict[str, List[dict]] = {}
-        for d in devices:
-            by_vendor.setdefault(d.vendor, []).append(d.to_dict())
-
-        # --- By room ---
-        by_room: Dict[str, List[dict]] = {}
-        for d in devices:
-            room_key = d.room or "Unassigned"
-            by_room.setdefault(room_key, []).append(d.to_dict())
-
-        # --- By category ---
-        by_category: Dict[str, List[dict]] = {}
-        for d in devices:
-            by_category.setdefault(d.category, []).append(d.to_dict())
+        # Groupings and their key order are maintained by _reindex(); each
+        # device is serialized once and shared across the three views.
+        dicts = {eid: d.to_dict() for eid, d in self._devices.items()}
+        by_vendor, by_room, by_category = self._by_vendor, self._by_room, self._by_category
 
         # --- Summary stats ---
-        vendors = set(d.vendor for d in devices)
-        rooms = set(d.room for d in devices if d.room)
-        offline = [d for d in devices if d.state == "unavailable"]
+        rooms = {d.room for d in self._devices.values() if d.room}
+        offline = [d for d in self._devices.values() if d.state == "unavailable"]
 
-        vendor_counts = {v: len(by_vendor[v]) for v in sorted(vendors)}
-        room_counts = {r: len(by_room[r]) for r in sorted(rooms)}
+        vendor_counts = {v: len(by_vendor[v]) for v in self._by_vendor_keys_sorted}
+        room_counts = {r: len(by_room[r]) for r in self._by_room_keys_sorted if r in rooms}
 
         return {
             "generated_at": datetime.now(timezone.utc).isoformat(),
             "summary": {
-                "total_entities": len(devices),
-                "total_vendors": len(vendors),
+                "total_entities": len(self._devices),
+                "total_vendors": len(by_vendor),
                 "total_rooms": len(rooms),
                 "offline_count": len(offline),
                 "vendor_counts": vendor_counts,
@@ -512,26 +542,26 @@ class DeviceRegistry:
             },
             "by_vendor": {
                 vendor: {
-                    "count": len(entries),
-                    "devices": entries,
+                    "count": len(by_vendor[vendor]),
+                    "devices": [dicts[d.entity_id] for d in by_vendor[vendor]],
                 }
-                for vendor, entries in sorted(by_vendor.items())
+                for vendor in self._by_vendor_keys_sorted
             },
             "by_room": {
                 room: {
-                    "count": len(entries),
-                    "devices": sorted(entries, key=lambda e: e["category"]),
+                    "count": len(by_room[room]),
+                    "devices": [dicts[d.entity_id] for d in by_room[room]],
                 }
-                for room, entries in sorted(by_room.items())
+                for room in self._by_room_keys_sorted
             },
             "by_category": {
                 cat: {
-                    "count": len(entries),
-                    "devices": entries,
+                    "count": len(by_category[cat]),
+                    "devices": [dicts[d.entity_id] for d in by_category[cat]],
                 }
-                for cat, entries in sorted(by_category.items())
+                for cat in self._by_category_keys_sorted
             },
-            "offline_devices": [d.to_dict() for d in offline],
+            "offline_devices": [dicts[d.entity_id] for d in offline],
         }
 
     def generate_ascii_topology(self) -> str:
@@ -641,6 +671,7 @@ class DeviceRegistry:
                     manufacturer=d_dict.get("manufacturer"),
                     area_name=d_dict.get("area_name"),
                 )
+            self._reindex()
             logger.info(f"Loaded {len(self._devices)} devices from cache")
             return True
         except Exception as exc:
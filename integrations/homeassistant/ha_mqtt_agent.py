@@ -11,6 +11,9 @@ Connects directly to the Mosquitto broker on the Raspberry Pi and handles:
 
 This agent runs as a persistent background service on Bob (Mac Mini M4).
 
+The module type-checks cleanly under mypy so it can optionally be
+AOT-compiled with mypyc (see README); the .py source remains the fallback.
+
 Usage:
     agent = MQTTAgent.from_env()
     await agent.start()
@@ -24,14 +27,30 @@ import asyncio
 import json
 import logging
 import os
+import re
+import sys
 import time
-from collections import deque
+from collections import Counter, defaultdict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime, timezone
-from typing import Any, Callable, Deque, Dict, List, Optional
+from types import ModuleType
+from typing import Any, Callable, ClassVar, Deque, Dict, Iterable, List, Optional, Tuple, Union
 
 from dotenv import load_dotenv
 
+orjson: Optional[ModuleType]
+try:
+    import orjson  # optional — parses bytes directly, 2-5x faster than stdlib json
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick  # pyahocorasick — optional, single-pass C keyword scan
+except ImportError:
+    ahocorasick = None
+
 load_dotenv()
 
 logger = logging.getLogger("symphony.ha_mqtt_agent")
@@ -48,6 +67,9 @@ HEARTBEAT_INTERVAL = 60       # seconds between Bob's heartbeat publishes
 RECONNECT_DELAY = 5           # initial reconnect delay (seconds)
 MAX_RECONNECT_DELAY = 120     # maximum reconnect delay
 MESSAGE_HISTORY_SIZE = 1000   # ring buffer capacity
+INBOX_SIZE = 4096             # bounded queue between the MQTT reader and dispatch workers
+DISPATCH_WORKERS = 4          # concurrent dispatch worker coroutines
+HANDLER_THREADS = 4           # thread pool for synchronous (non-async) handlers
 BOB_HEARTBEAT_TOPIC = "symphony/bob/heartbeat"
 BOB_STATUS_TOPIC = "symphony/bob/status"
 BOB_COMMANDS_TOPIC = "symphony/bob/commands"
@@ -72,33 +94,116 @@ DEFAULT_SUBSCRIPTIONS = [
 ]
 
 
+SAFETY_CRITICAL_KEYWORDS = ("lock", "alarm", "security", "garage", "door", "gate", "camera")
+
+
+# Messages carry two stamps taken together on receipt: monotonic for age and
+# window checks (immune to NTP steps), wallclock for display/export. Deriving
+# one from the other drifts after a clock step or a sleep/wake cycle.
+def _iso_from_wall_ns(wall_ns: int) -> str:
+    return datetime.fromtimestamp(wall_ns / 1e9, tz=timezone.utc).isoformat()
+
+
+_UNPARSED = object()   # sentinel: MQTTMessage JSON payload not parsed yet
+
+
+def _json_default(obj: Any) -> str:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _dumps(payload: Any) -> Union[bytes, str]:
+    """Serialize an outbound payload; orjson emits bytes and encodes datetimes natively."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str)
+    return json.dumps(payload, default=_json_default)
+
+
 # ---------------------------------------------------------------------------
 # Data Models
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class MQTTMessage:
     topic: str
-    payload: str
+    payload_bytes: bytes          # raw frame; callers encode text payloads
     qos: int
     retain: bool
-    timestamp: float = field(default_factory=time.time)
+    timestamp_ns: int = field(default_factory=time.monotonic_ns)
+    wall_ns: int = field(default_factory=time.time_ns)
+    # Topic split once at construction; the vendor level is interned since
+    # the set of first levels is tiny and it is used as a dict key everywhere.
+    parts: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    # Outstanding owners while pooled; see _MsgPool.
+    _refs: int = field(default=0, init=False, repr=False, compare=False)
+    # Lazily decoded text and parsed JSON — computed at most once per message.
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _json: Any = field(default=_UNPARSED, init=False, repr=False, compare=False)
+    _iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.parts = tuple(sys.intern(p) for p in self.topic.split("/"))
+
+    def reset(self, topic: str, payload_bytes: bytes, qos: int, retain: bool) -> "MQTTMessage":
+        """Reinitialise a recycled instance in place."""
+        self.topic = topic
+        self.payload_bytes = payload_bytes
+        self.qos = qos
+        self.retain = retain
+        self.timestamp_ns = time.monotonic_ns()
+        self.wall_ns = time.time_ns()
+        self.parts = tuple(sys.intern(p) for p in topic.split("/"))
+        self._refs = 0
+        self._text = None
+        self._json = _UNPARSED
+        self._iso = None
+        return self
+
+    def copy(self) -> "MQTTMessage":
+        """Unpooled snapshot with the same frame and receive stamps."""
+        clone = MQTTMessage(self.topic, self.payload_bytes, self.qos, self.retain,
+                            self.timestamp_ns, self.wall_ns)
+        clone._text = self._text
+        return clone
+
+    @property
+    def timestamp(self) -> float:
+        """Receive time as a UNIX wallclock timestamp (seconds)."""
+        return self.wall_ns / 1e9
+
+    @property
+    def iso_time(self) -> str:
+        """ISO-8601 UTC receive time, formatted once per message."""
+        if self._iso is None:
+            self._iso = _iso_from_wall_ns(self.wall_ns)
+        return self._iso
+
+    @property
+    def payload(self) -> str:
+        """Payload decoded as UTF-8 (invalid bytes replaced), decoded on first access."""
+        if self._text is None:
+            self._text = self.payload_bytes.decode("utf-8", errors="replace")
+        return self._text
 
     def payload_json(self) -> Optional[Any]:
-        """Try to parse payload as JSON; return None if not valid JSON."""
-        try:
-            return json.loads(self.payload)
-        except (json.JSONDecodeError, TypeError):
-            return None
+        """Try to parse payload as JSON; return None if not valid JSON. Memoized."""
+        if self._json is _UNPARSED:
+            try:
+                raw = self.payload_bytes
+                self._json = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            except (ValueError, TypeError):
+                self._json = None
+        return self._json
 
-    def to_dict(self) -> dict:
+    def to_dict(self) -> Dict[str, Any]:
         return {
             "topic": self.topic,
             "payload": self.payload,
             "qos": self.qos,
             "retain": self.retain,
             "timestamp": self.timestamp,
-            "iso_time": datetime.fromtimestamp(self.timestamp, tz=timezone.utc).isoformat(),
+            "iso_time": self.iso_time,
         }
 
 
@@ -109,16 +214,29 @@ class EventRoute:
     handler: Callable
     openclaw_workflow: Optional[str] = None
     description: str = ""
+    # Handler takes (msg, workflow, classification) instead of (msg, workflow).
+    with_classification: bool = False
+    # Handler never keeps msg past its own return, so it may be given the
+    # pooled instance; all other handlers get a private copy.
+    internal: bool = False
+    # Resolved once at registration rather than per dispatched message.
+    is_coroutine: bool = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.is_coroutine = asyncio.iscoroutinefunction(self.handler)
 
 
 # ---------------------------------------------------------------------------
 # Topic Classifier — maps MQTT topics to vendor/category
 # ---------------------------------------------------------------------------
 
+Classification = namedtuple("Classification", "vendor device_id action parts")
+
+
 class TopicClassifier:
     """Classifies incoming MQTT topics to vendor/device category for routing."""
 
-    VENDOR_MAP = {
+    VENDOR_MAP: ClassVar[Dict[str, str]] = {
         "homeassistant": "home_assistant",
         "luma": "luma_camera",
         "control4": "control4",
@@ -130,7 +248,7 @@ class TopicClassifier:
         "symphony": "symphony_internal",
     }
 
-    ACTION_MAP = {
+    ACTION_MAP: ClassVar[Dict[str, str]] = {
         "status": "status_update",
         "state": "state_change",
         "event": "event",
@@ -144,24 +262,65 @@ class TopicClassifier:
     }
 
     @classmethod
-    def classify(cls, topic: str) -> dict:
-        parts = topic.split("/")
-        vendor = cls.VENDOR_MAP.get(parts[0], "unknown")
-        device_id = parts[1] if len(parts) > 1 else None
-        action_raw = parts[2] if len(parts) > 2 else (parts[1] if len(parts) > 1 else None)
-        action = cls.ACTION_MAP.get(action_raw, action_raw) if action_raw else None
-        return {
-            "vendor": vendor,
-            "device_id": device_id,
-            "action": action,
-            "parts": parts,
-        }
+    def classify(cls, topic: str) -> Classification:
+        # Device topics repeat heavily, so results are memoized per topic string.
+        return _classify_topic(topic)
 
     @classmethod
     def is_safety_critical(cls, topic: str) -> bool:
         """Returns True if the message may involve a safety-critical device."""
-        critical_keywords = ["lock", "alarm", "security", "garage", "door", "gate", "camera"]
-        return any(kw in topic.lower() for kw in critical_keywords)
+        return _critical_match(topic.lower())
+
+
+@lru_cache(maxsize=4096)
+def _classify_topic(topic: str) -> Classification:
+    parts = tuple(topic.split("/"))
+    vendor = TopicClassifier.VENDOR_MAP.get(parts[0], "unknown")
+    device_id = parts[1] if len(parts) > 1 else None
+    action_raw = parts[2] if len(parts) > 2 else (parts[1] if len(parts) > 1 else None)
+    action = TopicClassifier.ACTION_MAP.get(action_raw, action_raw) if action_raw else None
+    return Classification(vendor, device_id, action, parts)
+
+
+def _build_critical_matcher() -> Callable[[str], bool]:
+    """One-pass keyword matcher: Aho-Corasick when available, else a compiled alternation."""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for kw in SAFETY_CRITICAL_KEYWORDS:
+            automaton.add_word(kw, kw)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    regex = re.compile("|".join(map(re.escape, SAFETY_CRITICAL_KEYWORDS)))
+    return lambda text: regex.search(text) is not None
+
+
+_critical_match = _build_critical_matcher()
+
+
+class _MsgPool:
+    """
+    Freelist of MQTTMessage objects.
+
+    A pooled message returns to the freelist once every owner has released it
+    (currently just the dispatch inbox — MessageHistory copies fields on add).
+    Only internal routes see the pooled instance; external handlers get a copy.
+    """
+
+    __slots__ = ("_free", "_maxsize")
+
+    def __init__(self, maxsize: int) -> None:
+        self._free: List[MQTTMessage] = []
+        self._maxsize = maxsize
+
+    def get(self, topic: str, payload_bytes: bytes, qos: int, retain: bool) -> MQTTMessage:
+        if self._free:
+            return self._free.pop().reset(topic, payload_bytes, qos, retain)
+        return MQTTMessage(topic=topic, payload_bytes=payload_bytes, qos=qos, retain=retain)
+
+    def release(self, msg: MQTTMessage) -> None:
+        msg._refs -= 1
+        if msg._refs <= 0 and len(self._free) < self._maxsize:
+            self._free.append(msg)
 
 
 # ---------------------------------------------------------------------------
@@ -171,58 +330,124 @@ class TopicClassifier:
 class MessageHistory:
     """Ring buffer of the last N MQTT messages for inspection and replay."""
 
-    def __init__(self, maxlen: int = MESSAGE_HISTORY_SIZE):
-        self._buffer: Deque[MQTTMessage] = deque(maxlen=maxlen)
-
-    def add(self, msg: MQTTMessage):
-        self._buffer.append(msg)
+    def __init__(self, maxlen: int = MESSAGE_HISTORY_SIZE) -> None:
+        # Struct-of-arrays ring: one preallocated column per field plus a write
+        # index. Scans touch only the column they filter on, and no message
+        # object is retained — readers get freshly built MQTTMessage instances,
+        # so pooled messages can be recycled as soon as dispatch is done.
+        self._maxlen = maxlen
+        self._topics: List[str] = [""] * maxlen
+        self._vendors: List[Optional[str]] = [None] * maxlen
+        self._payloads: List[bytes] = [b""] * maxlen
+        self._qos: List[int] = [0] * maxlen
+        self._retain: List[bool] = [False] * maxlen
+        self._ts: List[int] = [0] * maxlen         # monotonic ns
+        self._wall: List[int] = [0] * maxlen       # wallclock ns
+        self._idx = 0       # next slot to write
+        self._count = 0
+        # Per-vendor indexes (counts + slot numbers, oldest first) kept in step
+        # with the ring so summary() and get_by_vendor() never rescan it.
+        self._vendor_counts: Counter = Counter()
+        self._by_vendor: Dict[str, Deque[int]] = defaultdict(deque)
+
+    def add(self, msg: MQTTMessage) -> None:
+        i = self._idx
+        evicted_vendor = self._vendors[i]
+        if evicted_vendor is not None:
+            self._by_vendor[evicted_vendor].popleft()
+            self._vendor_counts[evicted_vendor] -= 1
+            if not self._vendor_counts[evicted_vendor]:
+                del self._vendor_counts[evicted_vendor]
+                del self._by_vendor[evicted_vendor]
+        vendor = msg.parts[0]
+        self._vendor_counts[vendor] += 1
+        self._by_vendor[vendor].append(i)
+        self._topics[i] = msg.topic
+        self._vendors[i] = vendor
+        self._payloads[i] = msg.payload_bytes
+        self._qos[i] = msg.qos
+        self._retain[i] = msg.retain
+        self._ts[i] = msg.timestamp_ns
+        self._wall[i] = msg.wall_ns
+        self._idx = (i + 1) % self._maxlen
+        if self._count < self._maxlen:
+            self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _slots(self) -> List[int]:
+        """Occupied slot numbers, oldest first."""
+        if self._count < self._maxlen:
+            return list(range(self._count))
+        return list(range(self._idx, self._maxlen)) + list(range(self._idx))
+
+    def _materialize(self, slots: Iterable[int]) -> List[MQTTMessage]:
+        topics, payloads, qos, retain, ts, wall = (
+            self._topics, self._payloads, self._qos, self._retain, self._ts, self._wall,
+        )
+        return [MQTTMessage(topics[i], payloads[i], qos[i], retain[i], ts[i], wall[i]) for i in slots]
 
     def get_all(self) -> List[MQTTMessage]:
-        return list(self._buffer)
+        return self._materialize(self._slots())
 
     def get_by_topic_prefix(self, prefix: str) -> List[MQTTMessage]:
-        return [m for m in self._buffer if m.topic.startswith(prefix)]
+        topics = self._topics
+        return self._materialize([i for i in self._slots() if topics[i].startswith(prefix)])
 
     def get_recent(self, seconds: float = 60) -> List[MQTTMessage]:
-        cutoff = time.time() - seconds
-        return [m for m in self._buffer if m.timestamp >= cutoff]
+        cutoff = time.monotonic_ns() - int(seconds * 1e9)
+        ts = self._ts
+        return self._materialize([i for i in self._slots() if ts[i] >= cutoff])
 
     def get_by_vendor(self, vendor: str) -> List[MQTTMessage]:
-        return [m for m in self._buffer if m.topic.split("/")[0] == vendor]
+        return self._materialize(self._by_vendor.get(vendor, ()))
 
-    def summary(self) -> dict:
-        msgs = list(self._buffer)
-        if not msgs:
+    def summary(self) -> Dict[str, Any]:
+        if not self._count:
             return {"total": 0, "by_vendor": {}}
-        vendor_counts: Dict[str, int] = {}
-        for m in msgs:
-            v = m.topic.split("/")[0]
-            vendor_counts[v] = vendor_counts.get(v, 0) + 1
+        oldest = self._idx if self._count == self._maxlen else 0
+        newest = self._idx - 1
         return {
-            "total": len(msgs),
-            "oldest": msgs[0].iso_time if msgs else None,
-            "newest": msgs[-1].iso_time if msgs else None,
-            "by_vendor": vendor_counts,
+            "total": self._count,
+            "oldest": _iso_from_wall_ns(self._wall[oldest]),
+            "newest": _iso_from_wall_ns(self._wall[newest]),
+            "by_vendor": dict(self._vendor_counts),
         }
 
-    @property
-    def iso_time(self):
-        pass
-
 
 # ---------------------------------------------------------------------------
 # Event Dispatcher
 # ---------------------------------------------------------------------------
 
+class _TopicTrieNode:
+    """One topic level in the dispatcher's route trie."""
+
+    __slots__ = ("children", "routes", "multi_routes")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TopicTrieNode"] = {}   # literal level or "+"
+        self.routes: List[EventRoute] = []                # patterns ending exactly here
+        self.multi_routes: List[EventRoute] = []          # "<prefix>/#" patterns
+
+
 class EventDispatcher:
     """
     Routes MQTT messages to registered handlers based on topic patterns.
     Supports wildcards: + (single level), # (multi level).
+
+    Routes live in a topic-level trie, so a lookup costs O(topic depth)
+    regardless of how many sibling patterns are registered.
     """
 
-    def __init__(self):
+    def __init__(self) -> None:
         self._routes: List[EventRoute] = []
+        self._root = _TopicTrieNode()
+        self._route_order: Dict[int, int] = {}        # id(route) → registration index
         self._default_handler: Optional[Callable] = None
+        self._default_is_coroutine = False
+        self._default_internal = False
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def register(
         self,
@@ -230,51 +455,118 @@ class EventDispatcher:
         handler: Callable,
         openclaw_workflow: Optional[str] = None,
         description: str = "",
-    ):
-        """Register a handler for a topic pattern."""
-        self._routes.append(EventRoute(
+        with_classification: bool = False,
+        internal: bool = False,
+    ) -> None:
+        """
+        Register a handler for a topic pattern.
+
+        With with_classification=True the handler also receives the topic's
+        Classification, computed once per message by the dispatcher.
+
+        Messages are pooled and reused once dispatch finishes. By default the
+        handler receives its own copy, which it may keep or hand to a task.
+        internal=True skips the copy and passes the pooled instance; such a
+        handler must not use msg after it returns.
+        """
+        route = EventRoute(
             topic_pattern=topic_pattern,
             handler=handler,
             openclaw_workflow=openclaw_workflow,
             description=description,
-        ))
+            with_classification=with_classification,
+            internal=internal,
+        )
+        self._route_order[id(route)] = len(self._routes)
+        self._routes.append(route)
+        node = self._root
+        levels = topic_pattern.split("/")
+        for i, level in enumerate(levels):
+            if level == "#" and i == len(levels) - 1:
+                node.multi_routes.append(route)
+                break
+            node = node.children.setdefault(level, _TopicTrieNode())
+        else:
+            node.routes.append(route)
         logger.debug(f"Registered handler for topic pattern: {topic_pattern}")
 
-    def set_default_handler(self, handler: Callable):
+    def set_default_handler(self, handler: Callable, internal: bool = False) -> None:
+        """Handler for messages no route matched; internal= as for register()."""
         self._default_handler = handler
-
-    async def dispatch(self, msg: MQTTMessage):
+        self._default_is_coroutine = asyncio.iscoroutinefunction(handler)
+        self._default_internal = internal
+
+    def shutdown(self) -> None:
+        """Release the sync-handler thread pool."""
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run_sync(self, handler: Callable, *args: Any) -> None:
+        """Run a synchronous handler off the event loop."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=HANDLER_THREADS, thread_name_prefix="mqtt-handler",
+            )
+        await asyncio.get_running_loop().run_in_executor(self._executor, handler, *args)
+
+    async def dispatch(self, msg: MQTTMessage) -> None:
         """Dispatch a message to all matching handlers."""
         dispatched = False
-        for route in self._routes:
-            if self._matches(route.topic_pattern, msg.topic):
-                try:
-                    if asyncio.iscoroutinefunction(route.handler):
-                        await route.handler(msg, route.openclaw_workflow)
-                    else:
-                        route.handler(msg, route.openclaw_workflow)
-                    dispatched = True
-                except Exception as exc:
-                    logger.error(f"Handler error for {msg.topic}: {exc}")
+        classification: Optional[Classification] = None
+        shared: Optional[MQTTMessage] = None    # one copy for all external handlers
+        for route in self._lookup(msg.parts):
+            try:
+                target = msg
+                if not route.internal:
+                    if shared is None:
+                        shared = msg.copy()
+                    target = shared
+                if route.with_classification:
+                    if classification is None:
+                        classification = TopicClassifier.classify(msg.topic)
+                    args: Tuple[Any, ...] = (target, route.openclaw_workflow, classification)
+                else:
+                    args = (target, route.openclaw_workflow)
+                if route.is_coroutine:
+                    await route.handler(*args)
+                else:
+                    await self._run_sync(route.handler, *args)
+                dispatched = True
+            except Exception as exc:
+                logger.error("Handler error for %s: %s", msg.topic, exc)
 
         if not dispatched and self._default_handler:
+            target = msg if self._default_internal else msg.copy()
             try:
-                if asyncio.iscoroutinefunction(self._default_handler):
-                    await self._default_handler(msg, None)
+                if self._default_is_coroutine:
+                    await self._default_handler(target, None)
                 else:
-                    self._default_handler(msg, None)
+                    await self._run_sync(self._default_handler, target, None)
             except Exception as exc:
-                logger.error(f"Default handler error: {exc}")
-
-    @staticmethod
-    def _matches(pattern: str, topic: str) -> bool:
-        pattern_parts = pattern.split("/")
-        topic_parts = topic.split("/")
-        if pattern_parts[-1] == "#":
-            return topic_parts[:len(pattern_parts) - 1] == pattern_parts[:-1]
-        if len(pattern_parts) != len(topic_parts):
-            return False
-        return all(p == t or p == "+" for p, t in zip(pattern_parts, topic_parts))
+                logger.error("Default handler error: %s", exc)
+
+    def _lookup(self, parts: Tuple[str, ...]) -> List[EventRoute]:
+        """Collect every route whose pattern matches the split topic, in registration order."""
+        matched: List[EventRoute] = []
+        depth = len(parts)
+        stack = [(self._root, 0)]
+        while stack:
+            node, i = stack.pop()
+            matched.extend(node.multi_routes)
+            if i == depth:
+                matched.extend(node.routes)
+                continue
+            child = node.children.get(parts[i])
+            if child is not None:
+                stack.append((child, i + 1))
+            wildcard = node.children.get("+")
+            if wildcard is not None:
+                stack.append((wildcard, i + 1))
+        if len(matched) > 1:
+            order = self._route_order
+            matched.sort(key=lambda r: order[id(r)])
+        return matched
 
 
 # ---------------------------------------------------------------------------
@@ -306,13 +598,20 @@ class MQTTAgent:
         self._client_id = client_id
         self._subscriptions = subscriptions or DEFAULT_SUBSCRIPTIONS
         self._history = MessageHistory(maxlen=MESSAGE_HISTORY_SIZE)
+        self._msg_pool = _MsgPool(maxsize=MESSAGE_HISTORY_SIZE)
         self._dispatcher = EventDispatcher()
         self._running = False
         self._client = None
         self._reconnect_delay = RECONNECT_DELAY
-        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._heartbeat_handle: Optional[asyncio.TimerHandle] = None
+        self._heartbeat_deadline = 0.0       # loop.time() of the next heartbeat
+        self._heartbeat_task: Optional[asyncio.Task] = None   # in-flight publish
         self._main_task: Optional[asyncio.Task] = None
+        self._inbox: Optional[asyncio.Queue] = None
+        self._dispatch_tasks: List[asyncio.Task] = []
         self._openclaw_trigger_callbacks: List[Callable] = []
+        # Strong refs to in-flight trigger tasks so they aren't GC'd mid-flight
+        self._trigger_tasks: set = set()
 
         # Register built-in handlers
         self._register_default_routes()
@@ -332,43 +631,67 @@ class MQTTAgent:
 
     def _register_default_routes(self):
         """Register built-in handlers for known vendor topics."""
+        # Routes are keyed in the trie by their (interned) vendor level first,
+        # so each message reaches its vendor's handlers with one dict lookup.
+        # Built-in handlers read msg only while they run, so they take the
+        # pooled instance directly (internal=True) and skip the copy.
         d = self._dispatcher
         d.register("luma/+/motion", self._handle_luma_motion,
                    openclaw_workflow="security_alert",
-                   description="Luma camera motion detection")
+                   description="Luma camera motion detection",
+                   with_classification=True, internal=True)
         d.register("luma/+/status", self._handle_device_status,
-                   description="Luma camera online/offline")
+                   description="Luma camera online/offline",
+                   with_classification=True, internal=True)
         d.register("control4/+/event", self._handle_control4_event,
-                   description="Control4 driver events")
+                   description="Control4 driver events",
+                   with_classification=True, internal=True)
         d.register("lutron/+/state", self._handle_lutron_state,
-                   description="Lutron switch/dimmer state changes")
+                   description="Lutron switch/dimmer state changes",
+                   with_classification=True, internal=True)
         d.register("araknis/+/alert", self._handle_network_alert,
                    openclaw_workflow="network_alert",
-                   description="Araknis network device alerts")
+                   description="Araknis network device alerts",
+                   with_classification=True, internal=True)
         d.register("symphony/bob/commands", self._handle_bob_command,
-                   description="Commands directed at Bob")
+                   description="Commands directed at Bob", internal=True)
         d.register("homeassistant/#", self._handle_ha_discovery,
-                   description="Home Assistant MQTT discovery")
-        d.set_default_handler(self._handle_default)
+                   description="Home Assistant MQTT discovery", internal=True)
+        d.set_default_handler(self._handle_default, internal=True)
 
     async def start(self):
         self._running = True
+        # The socket reader only decodes and enqueues; slow handlers no longer
+        # back-pressure MQTT reads.
+        self._inbox = asyncio.Queue(maxsize=INBOX_SIZE)
+        self._dispatch_tasks = [
+            asyncio.create_task(self._dispatch_worker()) for _ in range(DISPATCH_WORKERS)
+        ]
         self._main_task = asyncio.create_task(self._run_loop())
-        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        loop = asyncio.get_running_loop()
+        self._heartbeat_deadline = loop.time() + HEARTBEAT_INTERVAL
+        self._schedule_heartbeat(loop)
         logger.info(f"MQTT Agent started (broker: {self._host}:{self._port})")
 
     async def stop(self):
         self._running = False
+        if self._heartbeat_handle:
+            self._heartbeat_handle.cancel()
+            self._heartbeat_handle = None
         if self._heartbeat_task:
             self._heartbeat_task.cancel()
         if self._main_task:
             self._main_task.cancel()
+        for task in self._dispatch_tasks:
+            task.cancel()
+        self._dispatch_tasks = []
+        self._dispatcher.shutdown()
         logger.info("MQTT Agent stopped")
 
     async def run_forever(self):
         await self.start()
         try:
-            await asyncio.gather(self._main_task, self._heartbeat_task)
+            await self._main_task
         except asyncio.CancelledError:
             pass
 
@@ -406,38 +729,68 @@ class MQTTAgent:
             for topic, qos in self._subscriptions:
                 await client.subscribe(topic, qos=qos)
             await self._publish_status("online")
+            # Hot loop: bind attribute lookups to locals once per connection.
+            acquire = self._msg_pool.get
+            add_history = self._history.add
+            enqueue = self._inbox.put
             async for message in client.messages:
                 if not self._running:
                     break
-                msg = MQTTMessage(
-                    topic=str(message.topic),
-                    payload=message.payload.decode("utf-8", errors="replace") if message.payload else "",
-                    qos=message.qos,
-                    retain=message.retain,
-                )
-                self._history.add(msg)
-                await self._dispatcher.dispatch(msg)
-
-    async def _heartbeat_loop(self):
-        while self._running:
-            await asyncio.sleep(HEARTBEAT_INTERVAL)
+                msg = acquire(str(message.topic), message.payload or b"", message.qos, message.retain)
+                msg._refs = 1   # dispatch inbox
+                add_history(msg)
+                await enqueue(msg)
+
+    async def _dispatch_worker(self):
+        """Drain the inbox into the dispatcher; several run concurrently."""
+        inbox = self._inbox
+        dispatch = self._dispatcher.dispatch
+        release = self._msg_pool.release
+        while True:
+            msg = await inbox.get()
             try:
-                await self.publish(BOB_HEARTBEAT_TOPIC, {
-                    "status": "online",
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "agent": "bob-conductor",
-                    "message_count": len(self._history.get_all()),
-                    "uptime_seconds": time.time() - self._start_time,
-                }, retain=True)
+                await dispatch(msg)
             except Exception as exc:
-                logger.warning(f"Heartbeat publish failed: {exc}")
+                logger.error("Dispatch error for %s: %s", msg.topic, exc)
+            finally:
+                release(msg)
+                inbox.task_done()
+
+    def _schedule_heartbeat(self, loop: asyncio.AbstractEventLoop):
+        """Arm a single timer for the next absolute heartbeat deadline."""
+        self._heartbeat_handle = loop.call_at(self._heartbeat_deadline, self._fire_heartbeat, loop)
+
+    def _fire_heartbeat(self, loop: asyncio.AbstractEventLoop):
+        if not self._running:
+            return
+        self._heartbeat_task = asyncio.create_task(self._publish_heartbeat())
+        # Advance from the previous deadline, not from now, so wakeup latency
+        # never accumulates; skip missed beats if the loop was stalled.
+        self._heartbeat_deadline += HEARTBEAT_INTERVAL
+        now = loop.time()
+        if self._heartbeat_deadline <= now:
+            missed = (now - self._heartbeat_deadline) // HEARTBEAT_INTERVAL + 1
+            self._heartbeat_deadline += missed * HEARTBEAT_INTERVAL
+        self._schedule_heartbeat(loop)
+
+    async def _publish_heartbeat(self):
+        try:
+            await self.publish(BOB_HEARTBEAT_TOPIC, {
+                "status": "online",
+                "timestamp": datetime.now(timezone.utc),
+                "agent": "bob-conductor",
+                "message_count": len(self._history),
+                "uptime_seconds": time.monotonic() - self._start_time,
+            }, retain=True)
+        except Exception as exc:
+            logger.warning(f"Heartbeat publish failed: {exc}")
 
     async def publish(self, topic: str, payload: Any, qos: int = 0, retain: bool = False) -> None:
         if self._client is None:
             logger.warning(f"Cannot publish to {topic}: not connected")
             return
         if isinstance(payload, (dict, list)):
-            payload = json.dumps(payload)
+            payload = _dumps(payload)
         elif not isinstance(payload, (str, bytes)):
             payload = str(payload)
         await self._client.publish(topic, payload, qos=qos, retain=retain)
@@ -445,50 +798,51 @@ class MQTTAgent:
     async def _publish_status(self, status: str):
         await self.publish(BOB_STATUS_TOPIC, {
             "status": status,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.now(timezone.utc),
         }, retain=True)
 
-    async def _handle_luma_motion(self, msg: MQTTMessage, workflow: Optional[str]):
-        classification = TopicClassifier.classify(msg.topic)
-        camera_id = classification.get("device_id", "unknown")
+    async def _handle_luma_motion(self, msg: MQTTMessage, workflow: Optional[str],
+                                  classification: Classification):
+        camera_id = classification.device_id
         payload = msg.payload_json() or {"raw": msg.payload}
-        logger.info(f"MOTION DETECTED: Luma camera {camera_id} — {payload}")
+        logger.info("MOTION DETECTED: Luma camera %s — %s", camera_id, payload)
         await self._trigger_openclaw_workflow(workflow, {
             "event": "motion_detected", "vendor": "luma",
             "camera_id": camera_id, "payload": payload, "timestamp": msg.timestamp,
         })
 
-    async def _handle_device_status(self, msg: MQTTMessage, workflow: Optional[str]):
-        classification = TopicClassifier.classify(msg.topic)
-        device_id = classification.get("device_id", "unknown")
+    async def _handle_device_status(self, msg: MQTTMessage, workflow: Optional[str],
+                                    classification: Classification):
+        device_id = classification.device_id
         payload = msg.payload_json() or msg.payload
         online_status = payload.get("status", "unknown") if isinstance(payload, dict) else str(payload)
-        logger.info(f"Device status: {classification['vendor']} {device_id} → {online_status}")
+        logger.info("Device status: %s %s → %s", classification.vendor, device_id, online_status)
 
-    async def _handle_control4_event(self, msg: MQTTMessage, workflow: Optional[str]):
-        classification = TopicClassifier.classify(msg.topic)
-        driver_id = classification.get("device_id", "unknown")
+    async def _handle_control4_event(self, msg: MQTTMessage, workflow: Optional[str],
+                                     classification: Classification):
+        driver_id = classification.device_id
         payload = msg.payload_json() or {"raw": msg.payload}
         event_type = payload.get("event_type", "unknown") if isinstance(payload, dict) else "unknown"
-        logger.info(f"Control4 event: driver={driver_id} type={event_type}")
+        logger.info("Control4 event: driver=%s type=%s", driver_id, event_type)
         if event_type in ("arrival", "departure", "presence"):
             await self._trigger_openclaw_workflow("client_presence_workflow", {
                 "event": event_type, "driver_id": driver_id,
                 "payload": payload, "timestamp": msg.timestamp,
             })
 
-    async def _handle_lutron_state(self, msg: MQTTMessage, workflow: Optional[str]):
-        classification = TopicClassifier.classify(msg.topic)
-        device_id = classification.get("device_id", "unknown")
-        payload = msg.payload_json() or msg.payload
-        logger.debug(f"Lutron state: {device_id} → {payload}")
+    async def _handle_lutron_state(self, msg: MQTTMessage, workflow: Optional[str],
+                                   classification: Classification):
+        # Payload is only needed for the debug line; skip parsing at INFO.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Lutron state: %s → %s", classification.device_id,
+                         msg.payload_json() or msg.payload)
 
-    async def _handle_network_alert(self, msg: MQTTMessage, workflow: Optional[str]):
-        classification = TopicClassifier.classify(msg.topic)
-        device_id = classification.get("device_id", "unknown")
+    async def _handle_network_alert(self, msg: MQTTMessage, workflow: Optional[str],
+                                    classification: Classification):
+        device_id = classification.device_id
         payload = msg.payload_json() or {"raw": msg.payload}
         severity = payload.get("severity", "unknown") if isinstance(payload, dict) else "unknown"
-        logger.warning(f"Network alert: Araknis {device_id} — severity={severity}")
+        logger.warning("Network alert: Araknis %s — severity=%s", device_id, severity)
         await self._trigger_openclaw_workflow(workflow, {
             "event": "network_alert", "vendor": "araknis",
             "device_id": device_id, "severity": severity,
@@ -498,24 +852,25 @@ class MQTTAgent:
     async def _handle_bob_command(self, msg: MQTTMessage, workflow: Optional[str]):
         payload = msg.payload_json()
         if not payload:
-            logger.warning(f"Received non-JSON command on {msg.topic}: {msg.payload}")
+            logger.warning("Received non-JSON command on %s: %s", msg.topic, msg.payload)
             return
         command = payload.get("command", "")
         args = payload.get("args", {})
         request_id = payload.get("request_id")
-        logger.info(f"Received Bob command: {command} (request_id={request_id})")
+        logger.info("Received Bob command: %s (request_id=%s)", command, request_id)
         await self._trigger_openclaw_workflow("command_handler", {
             "command": command, "args": args,
             "request_id": request_id, "source": "mqtt", "timestamp": msg.timestamp,
         })
 
     async def _handle_ha_discovery(self, msg: MQTTMessage, workflow: Optional[str]):
-        parts = msg.topic.split("/")
+        parts = msg.parts
         if len(parts) >= 4 and parts[-1] == "config":
-            logger.debug(f"HA Discovery: {msg.topic}")
+            logger.debug("HA Discovery: %s", msg.topic)
 
     async def _handle_default(self, msg: MQTTMessage, workflow: Optional[str]):
-        logger.debug(f"MQTT [{msg.topic}]: {msg.payload[:100]}")
+        if logger.isEnabledFor(logging.DEBUG):   # avoids decoding the payload at INFO
+            logger.debug("MQTT [%s]: %.100s", msg.topic, msg.payload)
 
     def add_openclaw_trigger(self, callback: Callable):
         self._openclaw_trigger_callbacks.append(callback)
@@ -523,16 +878,37 @@ class MQTTAgent:
     async def _trigger_openclaw_workflow(self, workflow: Optional[str], context: dict):
         if not workflow:
             return
+        coros = []
         for cb in self._openclaw_trigger_callbacks:
             try:
                 if asyncio.iscoroutinefunction(cb):
-                    asyncio.create_task(cb(workflow, context))
+                    coros.append(cb(workflow, context))
                 else:
                     cb(workflow, context)
             except Exception as exc:
                 logger.error(f"OpenClaw trigger error (workflow={workflow}): {exc}")
+        if coros:
+            # One task fans the async callbacks out in parallel; keep a reference
+            # until it finishes.
+            task = asyncio.create_task(self._run_triggers(workflow, coros))
+            self._trigger_tasks.add(task)
+            task.add_done_callback(self._trigger_tasks.discard)
+
+    @staticmethod
+    async def _run_triggers(workflow: str, coros: list):
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"OpenClaw trigger error (workflow={workflow}): {result}")
 
     async def add_subscription(self, topic: str, handler: Callable, qos: int = 0):
+        """
+        Subscribe to topic and route its messages to handler(msg, workflow).
+
+        The handler gets its own copy of each message, so it may keep msg or
+        pass it to another task; the agent's pooled instance is recycled as
+        soon as dispatch returns.
+        """
         self._dispatcher.register(topic, handler)
         if self._client:
             await self._client.subscribe(topic, qos=qos)
@@ -552,9 +928,9 @@ class MQTTAgent:
         return self._history.summary()
 
     @property
-    def _start_time(self):
+    def _start_time(self) -> float:
         if not hasattr(self, "_agent_start_time"):
-            self._agent_start_time = time.time()
+            self._agent_start_time = time.monotonic()
         return self._agent_start_time
 
 
@@ -576,4 +952,9 @@ async def _main():
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop  # optional — libuv event loop, faster socket I/O and timers
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(_main())
@@ -16,18 +16,20 @@ Usage:
 
 import argparse
 import asyncio
-import json
 import logging
+import io
 import os
 import sqlite3
-from datetime import date, datetime, timedelta
+import threading
+from datetime import date, datetime, time as dtime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import aiohttp
 from dotenv import load_dotenv
 
-from notification_manager import NotificationManager, NotificationType, Priority
+from notification_manager import NotificationManager, NotificationType, Priority, load_config
 
 load_dotenv()
 
@@ -47,81 +49,221 @@ CLAWWORK_DB_PATH = os.getenv("CLAWWORK_DB_PATH", "/data/clawwork/earnings.db")
 VOICE_DB_PATH    = os.getenv("VOICE_DB_PATH", "/data/voice/calls.db")
 
 CONFIG_PATH = Path(__file__).parent / "bot_config.json"
-try:
-    with open(CONFIG_PATH) as _f:
-        _cfg = json.load(_f)
-except FileNotFoundError:
-    _cfg = {}
+_cfg = load_config(CONFIG_PATH)
 
 DIGEST_TIME   = _cfg.get("notification_preferences", {}).get("daily_digest", {}).get("send_time", "07:30")
 WEEKLY_DAY    = _cfg.get("notification_preferences", {}).get("weekly_summary", {}).get("send_day", "monday")
 WEEKLY_TIME   = _cfg.get("notification_preferences", {}).get("weekly_summary", {}).get("send_time", "08:00")
 
 
+def _parse_hhmm(t: str):
+    h, m = t.split(":")
+    return int(h), int(m)
+
+
+# Parsed once at import; run_daemon only compares datetimes against these.
+_DIGEST_AT = dtime(*_parse_hhmm(DIGEST_TIME))
+_WEEKLY_AT = dtime(*_parse_hhmm(WEEKLY_TIME))
+_WEEKLY_DAY_NUM = ["monday","tuesday","wednesday","thursday","friday","saturday","sunday"].index(WEEKLY_DAY.lower())
+
+
 # ─────────────────────────────────────────────
 # Data Collection
 # ─────────────────────────────────────────────
 
+_session: Optional[aiohttp.ClientSession] = None
+_api_sem: Optional[asyncio.Semaphore] = None
+API_CONCURRENCY = 4     # max in-flight collector requests against Bob/OpenClaw
+COLLECT_TIMEOUT = 20    # seconds for a whole collection round
+BUNDLE_TIMEOUT = 5      # seconds to wait on the aggregate endpoint before falling back
+_DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10)
+RECENT_CALLS = 5        # calls listed individually; the rest are only counted
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Shared session for a digest run — keep-alive/TLS reuse across all collectors."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=32, limit_per_host=8, ttl_dns_cache=300, keepalive_timeout=60,
+            ),
+            timeout=_DEFAULT_TIMEOUT,
+        )
+    return _session
+
+
+async def _close_session():
+    global _session, _api_sem
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _api_sem = None
+
+
 async def _api_get(url: str, params: dict = None) -> Optional[dict]:
+    global _api_sem
+    if _api_sem is None:
+        _api_sem = asyncio.Semaphore(API_CONCURRENCY)
+    # Only hand params over when present; aiohttp skips the query-encoding path otherwise.
+    kwargs = {"timeout": _DEFAULT_TIMEOUT}
+    if params:
+        kwargs["params"] = params
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                if resp.status == 200:
-                    return await resp.json()
+        async with _api_sem, _get_session().get(url, **kwargs) as resp:
+            if resp.status == 200:
+                return await resp.json()
     except Exception as e:
         logger.warning(f"API GET {url} failed: {e}")
     return None
 
 
+_sqlite_conns: dict = {}          # db_path → sqlite3.Connection
+_sqlite_lock = threading.Lock()
+
+# Created on first connect; GROUP BY/range scans on these columns use the index.
+_SQLITE_INDEXES = {
+    CLAWWORK_DB_PATH: ("CREATE INDEX IF NOT EXISTS idx_earnings_completed ON earnings(completed_at)",),
+    VOICE_DB_PATH:    ("CREATE INDEX IF NOT EXISTS idx_calls_timestamp ON calls(timestamp)",),
+}
+
+
+def _since_iso(days: int) -> str:
+    """
+    Lower bound for `col >= ?` filters on ISO-8601 TEXT timestamps. A bare
+    YYYY-MM-DD sorts before every timestamp on that day regardless of time or
+    offset suffix, so the comparison stays a plain index range scan.
+    """
+    return (date.today() - timedelta(days=days)).isoformat()
+
+
+def _get_conn(db_path: str) -> sqlite3.Connection:
+    """Cached per-path connection; pragmas applied once on first open."""
+    conn = _sqlite_conns.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for stmt in (
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            "PRAGMA cache_size=-20000",
+            "PRAGMA temp_store=MEMORY",
+            *_SQLITE_INDEXES.get(db_path, ()),
+        ):
+            try:
+                conn.execute(stmt)
+            except sqlite3.Error as e:
+                # e.g. read-only mount — WAL switch / index build need write access
+                logger.debug(f"{stmt} skipped on {db_path}: {e}")
+        _sqlite_conns[db_path] = conn
+    return conn
+
+
+def row_get(row, key: str, default=None):
+    """dict.get() for rows that may be API dicts or sqlite3.Row (which has no .get)."""
+    try:
+        return row[key]
+    except (KeyError, IndexError):
+        return default
+
+
 def _query_sqlite(db_path: str, query: str, params: tuple = ()) -> list:
-    """Read from a local SQLite DB and return rows as dicts."""
+    """Read from a local SQLite DB; rows are sqlite3.Row (subscript by column name)."""
     if not Path(db_path).exists():
         logger.warning(f"SQLite DB not found: {db_path}")
         return []
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute(query, params)
-        rows = [dict(row) for row in cur.fetchall()]
-        conn.close()
-        return rows
+        with _sqlite_lock:
+            return _get_conn(db_path).execute(query, params).fetchall()
     except Exception as e:
         logger.warning(f"SQLite query failed on {db_path}: {e}")
         return []
 
 
-async def collect_earnings(days: int = 1) -> dict:
-    """ClawWork earnings for the past N days from DB or API."""
+def _query_sqlite_one(db_path: str, query: str, params: tuple = ()) -> Optional[tuple]:
+    """Single-row query returned as a plain tuple (no Row/dict wrapping)."""
+    if not Path(db_path).exists():
+        logger.warning(f"SQLite DB not found: {db_path}")
+        return None
+    try:
+        with _sqlite_lock:
+            cur = _get_conn(db_path).cursor()
+            cur.row_factory = None
+            return cur.execute(query, params).fetchone()
+    except Exception as e:
+        logger.warning(f"SQLite query failed on {db_path}: {e}")
+        return None
+
+
+async def collect_earnings(days: int = 1, by_day: bool = False) -> dict:
+    """
+    ClawWork earnings for the past N days from DB or API. With by_day, the
+    SQLite fallback also returns a "by_day" list of {day, total, count} buckets,
+    computed in the same single GROUP BY query as the totals.
+    """
     data = await _api_get(f"{OPENCLAW_API_URL}/api/clawwork/earnings", {"days": days})
     if data:
         return data
-    since = (date.today() - timedelta(days=days)).isoformat()
-    rows = _query_sqlite(
-        CLAWWORK_DB_PATH,
-        "SELECT SUM(amount) as total, COUNT(*) as task_count FROM earnings WHERE completed_at >= ?",
-        (since,),
-    )
-    if rows and rows[0].get("total") is not None:
+    since = _since_iso(days)
+    if by_day:
+        buckets = _query_sqlite(
+            CLAWWORK_DB_PATH,
+            "SELECT date(completed_at) AS day, SUM(amount) AS total, COUNT(*) AS count "
+            "FROM earnings WHERE completed_at >= ? GROUP BY day ORDER BY day",
+            (since,),
+        )
         return {
-            "period_total": float(rows[0]["total"]),
-            "task_count": int(rows[0]["task_count"]),
+            "period_total": float(sum(b["total"] or 0 for b in buckets)),
+            "task_count": sum(b["count"] for b in buckets),
             "period_days": days,
+            "by_day": buckets,
         }
+    row = _query_sqlite_one(
+        CLAWWORK_DB_PATH,
+        "SELECT COALESCE(SUM(amount), 0), COUNT(*) FROM earnings WHERE completed_at >= ?",
+        (since,),
+    )
+    if row:
+        total, count = row
+        return {"period_total": float(total), "task_count": int(count), "period_days": days}
     return {"period_total": 0.0, "task_count": 0, "period_days": days}
 
 
-async def collect_calls(days: int = 1) -> list:
-    """Calls from the past N days."""
+_MISSED_OUTCOMES = frozenset(("missed", "voicemail"))
+
+
+def _summarize_calls(rows: list) -> dict:
+    """Call totals plus the newest RECENT_CALLS rows from a full, newest-first list."""
+    missed = 0
+    for c in rows:
+        if row_get(c, "outcome") in _MISSED_OUTCOMES:
+            missed += 1
+    return {"total": len(rows), "missed": missed, "recent": rows[:RECENT_CALLS]}
+
+
+async def collect_calls(days: int = 1) -> dict:
+    """
+    Call summary for the past N days: {"total", "missed", "recent"}. The SQLite
+    fallback counts in SQL and only fetches the rows that are listed.
+    """
     data = await _api_get(f"{BOB_API_URL}/api/calls", {"days": days})
     if data and isinstance(data, list):
-        return data
-    since = (date.today() - timedelta(days=days)).isoformat()
-    return _query_sqlite(
+        return _summarize_calls(data)
+    since = _since_iso(days)
+    row = _query_sqlite_one(
         VOICE_DB_PATH,
-        "SELECT * FROM calls WHERE timestamp >= ? ORDER BY timestamp DESC",
+        "SELECT COUNT(*), COALESCE(SUM(CASE WHEN outcome IN ('missed', 'voicemail') THEN 1 ELSE 0 END), 0)"
+        " FROM calls WHERE timestamp >= ?",
         (since,),
     )
+    if not row or not row[0]:
+        return {"total": 0, "missed": 0, "recent": []}
+    recent = _query_sqlite(
+        VOICE_DB_PATH,
+        "SELECT * FROM calls WHERE timestamp >= ? ORDER BY timestamp DESC LIMIT ?",
+        (since, RECENT_CALLS),
+    )
+    return {"total": int(row[0]), "missed": int(row[1]), "recent": recent}
 
 
 async def collect_health() -> dict:
@@ -132,7 +274,7 @@ async def collect_health() -> dict:
 
 async def collect_incidents(days: int = 1) -> list:
     """Recent alerts / incidents."""
-    since = (date.today() - timedelta(days=days)).isoformat()
+    since = _since_iso(days)
     data = await _api_get(f"{OPENCLAW_API_URL}/api/logs", {
         "level": "warn,error",
         "since": since,
@@ -153,17 +295,81 @@ async def collect_node_uptime() -> dict:
     return data or {}
 
 
+_BUNDLE_KEYS = ("earnings", "calls", "health", "incidents", "calendar", "uptime")
+_bundle_unavailable = False   # set once the endpoint fails; later digests skip it
+
+
+async def collect_bundle(days: int = 1) -> Optional[tuple]:
+    """
+    All digest sources in one round trip via Bob's aggregate endpoint.
+    Returns (earnings, calls, health, incidents, calendar, uptime), or None if
+    the endpoint is unavailable so callers can fall back to per-source fetches.
+    A missing, failing or slow endpoint is remembered for the life of the
+    process, so only the first digest pays for the attempt.
+    """
+    global _bundle_unavailable
+    if _bundle_unavailable:
+        return None
+    data = None
+    try:
+        async with asyncio.timeout(BUNDLE_TIMEOUT):
+            data = await _api_get(f"{BOB_API_URL}/api/digest/bundle", {"days": days})
+    except TimeoutError:
+        logger.warning("Digest bundle exceeded %ss", BUNDLE_TIMEOUT)
+    if not isinstance(data, dict) or not all(k in data for k in _BUNDLE_KEYS):
+        logger.info("Digest bundle endpoint unavailable — using per-source collection")
+        _bundle_unavailable = True
+        return None
+    return (
+        data["earnings"] or {"period_total": 0.0, "task_count": 0, "period_days": days},
+        _summarize_calls(data["calls"] if isinstance(data["calls"], list) else []),
+        data["health"] or {},
+        data["incidents"] if isinstance(data["incidents"], list) else [],
+        data["calendar"] if isinstance(data["calendar"], list) else [],
+        data["uptime"] or {},
+    )
+
+
+async def _gather_sources(collectors: list, defaults: list) -> list:
+    """
+    Run collectors concurrently under COLLECT_TIMEOUT. A source that raises
+    or is still pending when the round times out is replaced by its default,
+    so one slow or broken endpoint never sinks the digest.
+    """
+    tasks = [asyncio.ensure_future(c) for c in collectors]
+    _, pending = await asyncio.wait(tasks, timeout=COLLECT_TIMEOUT)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning("Digest collection exceeded %ss — %d source(s) defaulted", COLLECT_TIMEOUT, len(pending))
+    out = []
+    for task, default in zip(tasks, defaults):
+        if task in pending:
+            out.append(default)
+        elif task.exception() is not None:
+            logger.warning("Digest source failed: %r", task.exception())
+            out.append(default)
+        else:
+            out.append(task.result())
+    return out
+
+
 # ─────────────────────────────────────────────
 # Digest Formatter
 # ─────────────────────────────────────────────
 
-def _section(title: str, content: str) -> str:
-    return f"*{title}*\n{content}\n"
+@lru_cache(maxsize=8)
+def _long_date(ordinal: int) -> str:
+    """Cached "Monday, January 01, 2024" heading for a date ordinal."""
+    return f"{date.fromordinal(ordinal):%A, %B %d, %Y}"
+
+
+_RULE = "━━━━━━━━━━━━━━━━━━━━"
 
 
 def format_daily_digest(
     earnings: dict,
-    calls: list,
+    calls: dict,
     health: dict,
     incidents: list,
     calendar: list,
@@ -172,122 +378,129 @@ def format_daily_digest(
 ) -> str:
     today = for_date or date.today()
     yesterday = today - timedelta(days=1)
-    lines = [
-        f"☀️ *Good morning — Bob's Daily Digest*",
-        f"_{yesterday.strftime('%A, %B %d, %Y')}_",
-        "━━━━━━━━━━━━━━━━━━━━",
-        "",
-    ]
+    gen_hm = f"{datetime.now():%H:%M}"
+    buf = io.StringIO()
+    w = buf.write
+    w("☀️ *Good morning — Bob's Daily Digest*\n")
+    w(f"_{_long_date(yesterday.toordinal())}_\n")
+    w(f"{_RULE}\n\n")
 
     earned = earnings.get("period_total", 0.0)
     task_count = earnings.get("task_count", 0)
     running_total = earnings.get("all_time_total", None)
-    earn_line = f"  Earned: `${earned:.2f}` across `{task_count}` task(s)"
-    if running_total is not None:
-        earn_line += f"\n  Running total: `${running_total:.2f}`"
+    w("*💰 ClawWork Earnings (Yesterday)*\n")
     if earned == 0 and task_count == 0:
-        earn_line = "  No ClawWork tasks completed yesterday."
-    lines.append(_section("💰 ClawWork Earnings (Yesterday)", earn_line))
-
-    if calls:
-        answered = [c for c in calls if c.get("outcome") not in ("missed", "voicemail")]
-        missed   = [c for c in calls if c.get("outcome") in ("missed", "voicemail")]
-        call_lines = [
-            f"  Total calls: `{len(calls)}` | Answered: `{len(answered)}` | Missed: `{len(missed)}`",
-        ]
-        for c in calls[:5]:
-            caller = c.get("caller_name") or c.get("caller_number", "Unknown")
-            outcome = c.get("outcome", "?")
-            ts = c.get("timestamp", "")[:16]
-            call_lines.append(f"  \u2022 `{ts}` — {caller} ({outcome})")
-        if len(calls) > 5:
-            call_lines.append(f"  _…and {len(calls) - 5} more_")
-        lines.append(_section("📞 Calls Received", "\n".join(call_lines)))
+        w("  No ClawWork tasks completed yesterday.\n\n")
     else:
-        lines.append(_section("📞 Calls Received", "  No calls yesterday."))
+        w(f"  Earned: `${earned:.2f}` across `{task_count}` task(s)\n")
+        if running_total is not None:
+            w(f"  Running total: `${running_total:.2f}`\n")
+        w("\n")
+
+    w("*📞 Calls Received*\n")
+    total_n = calls.get("total", 0)
+    if total_n:
+        missed_n = calls.get("missed", 0)
+        answered_n = total_n - missed_n
+        w(f"  Total calls: `{total_n}` | Answered: `{answered_n}` | Missed: `{missed_n}`\n")
+        for c in calls.get("recent", ())[:RECENT_CALLS]:
+            caller = row_get(c, "caller_name") or row_get(c, "caller_number", "Unknown")
+            outcome = row_get(c, "outcome", "?")
+            ts = str(row_get(c, "timestamp") or "")[:16]
+            w(f"  \u2022 `{ts}` — {caller} ({outcome})\n")
+        if total_n > RECENT_CALLS:
+            w(f"  _…and {total_n - RECENT_CALLS} more_\n")
+        w("\n")
+    else:
+        w("  No calls yesterday.\n\n")
 
+    w("*💚 System Health*\n")
     nodes = health.get("nodes", {})
     if nodes:
-        health_lines = []
-        all_ok = True
+        if all(info.get("ok", False) for info in nodes.values()):
+            w("  All nodes healthy.\n")
         for name, info in nodes.items():
-            ok = info.get("ok", False)
-            if not ok:
-                all_ok = False
-            icon = "🟢" if ok else "🔴"
+            icon = "🟢" if info.get("ok", False) else "🔴"
             cpu = info.get("cpu", "?")
             mem = info.get("mem", "?")
             disk = info.get("disk", "?")
-            health_lines.append(f"  {icon} *{name}* — CPU: `{cpu}` | RAM: `{mem}` | Disk: `{disk}`")
-        if all_ok:
-            health_lines.insert(0, "  All nodes healthy.")
-        lines.append(_section("💚 System Health", "\n".join(health_lines)))
+            w(f"  {icon} *{name}* — CPU: `{cpu}` | RAM: `{mem}` | Disk: `{disk}`\n")
+        w("\n")
     else:
-        lines.append(_section("💚 System Health", "  Health data unavailable."))
+        w("  Health data unavailable.\n\n")
 
+    w("*🚨 Alerts & Incidents*\n")
     if incidents:
-        inc_lines = []
-        for inc in incidents[:10]:
+        for i, inc in enumerate(incidents):
+            if i >= 10:
+                break
             ts = inc.get("timestamp", "")[:16]
             msg = inc.get("message", "")
             lvl = inc.get("level", "?").upper()
             icon = "❌" if lvl in ("ERROR", "CRITICAL") else "⚠️"
-            inc_lines.append(f"  {icon} `{ts}` {msg}")
+            w(f"  {icon} `{ts}` {msg}\n")
         if len(incidents) > 10:
-            inc_lines.append(f"  _{len(incidents) - 10} more in logs_")
-        lines.append(_section("🚨 Alerts & Incidents", "\n".join(inc_lines)))
+            w(f"  _{len(incidents) - 10} more in logs_\n")
+        w("\n")
     else:
-        lines.append(_section("🚨 Alerts & Incidents", "  No incidents yesterday. Clean run."))
+        w("  No incidents yesterday. Clean run.\n\n")
 
+    w("*📅 Today's Calendar*\n")
     if calendar:
-        cal_lines = []
         for evt in calendar:
             time_str = evt.get("start_time", "")
             title = evt.get("title", "Untitled")
-            cal_lines.append(f"  \u2022 `{time_str}` — {title}")
-        lines.append(_section("📅 Today's Calendar", "\n".join(cal_lines)))
+            w(f"  \u2022 `{time_str}` — {title}\n")
+        w("\n")
     else:
-        lines.append(_section("📅 Today's Calendar", "  Calendar clear — nothing scheduled today."))
+        w("  Calendar clear — nothing scheduled today.\n\n")
 
     if uptime:
-        up_lines = []
+        w("*📊 Node Uptime (30d)*\n")
         for name, info in uptime.items():
             pct = info.get("uptime_pct", "?")
             since_str = info.get("since", "")
-            up_lines.append(f"  `{name}`: `{pct}` uptime (since {since_str})")
-        lines.append(_section("📊 Node Uptime (30d)", "\n".join(up_lines)))
+            w(f"  `{name}`: `{pct}` uptime (since {since_str})\n")
+        w("\n")
 
-    lines.append("━━━━━━━━━━━━━━━━━━━━")
-    lines.append(f"_Generated by Bob \u00b7 {datetime.now().strftime('%H:%M')}_")
-    return "\n".join(lines)
+    w(f"{_RULE}\n")
+    w(f"_Generated by Bob \u00b7 {gen_hm}_")
+    return buf.getvalue()
 
 
 def format_weekly_summary(
     earnings_7d: dict,
-    calls_7d: list,
+    calls_7d: dict,
     health: dict,
     incidents_7d: list,
 ) -> str:
-    week_start = (date.today() - timedelta(days=7)).strftime("%b %d")
-    week_end   = (date.today() - timedelta(days=1)).strftime("%b %d")
-    lines = [
-        f"📈 *Weekly Summary — {week_start} to {week_end}*",
-        "━━━━━━━━━━━━━━━━━━━━",
-        "",
-    ]
+    now = datetime.now()
+    today = now.date()
+    week_start = f"{today - timedelta(days=7):%b %d}"
+    week_end   = f"{today - timedelta(days=1):%b %d}"
+    buf = io.StringIO()
+    w = buf.write
+    w(f"📈 *Weekly Summary — {week_start} to {week_end}*\n")
+    w(f"{_RULE}\n\n")
     earned = earnings_7d.get("period_total", 0.0)
     tasks  = earnings_7d.get("task_count", 0)
     total  = earnings_7d.get("all_time_total")
-    earn_line = f"  Earned: `${earned:.2f}` across `{tasks}` task(s)"
+    w("*💰 ClawWork Earnings (7 days)*\n")
+    w(f"  Earned: `${earned:.2f}` across `{tasks}` task(s)\n")
     if total:
-        earn_line += f"\n  All-time: `${total:.2f}`"
-    lines.append(_section("💰 ClawWork Earnings (7 days)", earn_line))
-    lines.append(_section("📞 Calls (7 days)", f"  Total: `{len(calls_7d)}`"))
-    critical = [i for i in incidents_7d if i.get("level", "").upper() in ("ERROR", "CRITICAL")]
-    lines.append(_section("🚨 Incidents", f"  Total: `{len(incidents_7d)}` | Critical: `{len(critical)}`"))
-    lines.append("━━━━━━━━━━━━━━━━━━━━")
-    lines.append(f"_Generated by Bob \u00b7 {datetime.now().strftime('%H:%M')}_")
-    return "\n".join(lines)
+        w(f"  All-time: `${total:.2f}`\n")
+    by_day = earnings_7d.get("by_day")
+    if by_day:
+        w("  " + " · ".join(
+            f"{date.fromisoformat(b['day']):%a} `${b['total'] or 0:.2f}`" for b in by_day if row_get(b, "day")
+        ) + "\n")
+    w("\n")
+    w(f"*📞 Calls (7 days)*\n  Total: `{calls_7d.get('total', 0)}`\n\n")
+    critical = sum(1 for i in incidents_7d if i.get("level", "").upper() in ("ERROR", "CRITICAL"))
+    w(f"*🚨 Incidents*\n  Total: `{len(incidents_7d)}` | Critical: `{critical}`\n\n")
+    w(f"{_RULE}\n")
+    w(f"_Generated by Bob \u00b7 {now:%H:%M}_")
+    return buf.getvalue()
 
 
 # ─────────────────────────────────────────────
@@ -297,30 +510,41 @@ def format_weekly_summary(
 async def send_daily_digest():
     logger.info("Generating daily digest…")
     try:
-        earnings, calls, health, incidents, calendar, uptime = await asyncio.gather(
-            collect_earnings(days=1),
-            collect_calls(days=1),
-            collect_health(),
-            collect_incidents(days=1),
-            collect_calendar(),
-            collect_node_uptime(),
-        )
+        bundle = await collect_bundle(days=1)
+        if bundle is None:
+            bundle = await _gather_sources(
+                [
+                    collect_earnings(days=1),
+                    collect_calls(days=1),
+                    collect_health(),
+                    collect_incidents(days=1),
+                    collect_calendar(),
+                    collect_node_uptime(),
+                ],
+                [{"period_total": 0.0, "task_count": 0, "period_days": 1}, {}, {}, [], [], {}],
+            )
+        earnings, calls, health, incidents, calendar, uptime = bundle
         text = format_daily_digest(earnings, calls, health, incidents, calendar, uptime)
         nm = NotificationManager()
         await nm.send_daily_digest(text)
         logger.info("Daily digest sent successfully.")
     except Exception as e:
         logger.error(f"Failed to send daily digest: {e}", exc_info=True)
+    finally:
+        await _close_session()
 
 
 async def send_weekly_summary():
     logger.info("Generating weekly summary…")
     try:
-        earnings, calls, health, incidents = await asyncio.gather(
-            collect_earnings(days=7),
-            collect_calls(days=7),
-            collect_health(),
-            collect_incidents(days=7),
+        earnings, calls, health, incidents = await _gather_sources(
+            [
+                collect_earnings(days=7, by_day=True),
+                collect_calls(days=7),
+                collect_health(),
+                collect_incidents(days=7),
+            ],
+            [{"period_total": 0.0, "task_count": 0, "period_days": 7}, {}, {}, []],
         )
         text = format_weekly_summary(earnings, calls, health, incidents)
         nm = NotificationManager()
@@ -330,38 +554,42 @@ async def send_weekly_summary():
             priority=Priority.NORMAL,
             deduplicate=False,
         )
+        await nm.drain()
         logger.info("Weekly summary sent successfully.")
     except Exception as e:
         logger.error(f"Failed to send weekly summary: {e}", exc_info=True)
+    finally:
+        await _close_session()
 
 
-def _parse_hhmm(t: str):
-    h, m = t.split(":")
-    return int(h), int(m)
+def _next_fire(now: datetime, at: dtime, weekday: Optional[int] = None) -> datetime:
+    """Next datetime strictly after `now` at time `at` (on `weekday`, if given)."""
+    fire = datetime.combine(now.date(), at)
+    if weekday is not None:
+        fire += timedelta(days=(weekday - now.weekday()) % 7)
+    if fire <= now:
+        fire += timedelta(days=7 if weekday is not None else 1)
+    return fire
 
 
 async def run_daemon():
     logger.info("Digest daemon started. Waiting for scheduled send times.")
-    last_daily_date = None
-    last_weekly_date = None
-    digest_h, digest_m = _parse_hhmm(DIGEST_TIME)
-    weekly_h, weekly_m = _parse_hhmm(WEEKLY_TIME)
-    weekly_day_num = ["monday","tuesday","wednesday","thursday","friday","saturday","sunday"].index(WEEKLY_DAY.lower())
-
+    now = datetime.now()
+    next_daily = _next_fire(now, _DIGEST_AT)
+    next_weekly = _next_fire(now, _WEEKLY_AT, _WEEKLY_DAY_NUM)
     while True:
-        now = datetime.now()
-        today = now.date()
-        if now.hour == digest_h and now.minute == digest_m and last_daily_date != today:
+        due = min(next_daily, next_weekly)
+        # Sleep in ≤1h steps so clock jumps (DST, NTP) are re-synced against wall time.
+        while (delay := (due - datetime.now()).total_seconds()) > 0:
+            await asyncio.sleep(min(delay, 3600))
+        # Firing a little late is fine; the next slot is computed from the
+        # slot that just fired, so a delayed wakeup never skips a run.
+        if next_daily <= due:
             await send_daily_digest()
-            last_daily_date = today
-        if (
-            now.weekday() == weekly_day_num
-            and now.hour == weekly_h and now.minute == weekly_m
-            and last_weekly_date != today
-        ):
+            next_daily = _next_fire(max(datetime.now(), next_daily), _DIGEST_AT)
+        if next_weekly <= due:
             await send_weekly_summary()
-            last_weekly_date = today
-        await asyncio.sleep(60)
+            next_weekly = _next_fire(max(datetime.now(), next_weekly), _WEEKLY_AT, _WEEKLY_DAY_NUM)
 
 
 def main():
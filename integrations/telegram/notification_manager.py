@@ -14,6 +14,10 @@ Usage:
         message="Finished processing proposal for Acme Corp",
         priority=Priority.NORMAL,
     )
+    await nm.drain()   # short-lived scripts: wait for queued sends before exiting
+
+Non-critical notifications go through an in-process outbox that batches and
+coalesces them; CRITICAL ones are sent immediately.
 """
 
 import asyncio
@@ -22,8 +26,11 @@ import json
 import logging
 import os
 import time
+from collections import OrderedDict
 from datetime import datetime, time as dtime
 from enum import Enum
+from functools import lru_cache
+from itertools import chain, groupby
 from pathlib import Path
 from typing import Optional, Union
 
@@ -32,6 +39,12 @@ from dotenv import load_dotenv
 from telegram import Bot, InputFile
 from telegram.constants import ParseMode
 from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
+
+try:
+    import orjson  # optional — faster parse of bot_config.json
+except ImportError:
+    orjson = None
 
 load_dotenv()
 
@@ -46,94 +59,106 @@ class Priority(Enum):
 
 
 class NotificationType(Enum):
-    TASK_COMPLETE    = "task_complete"
-    TASK_FAILED      = "task_failed"
-    CLAWWORK_EARNINGS = "clawwork_earnings"
-    CLAWWORK_PAUSED   = "clawwork_paused"
-    CLAWWORK_RESUMED  = "clawwork_resumed"
-    CALL_RECEIVED    = "call_received"
-    CALL_MISSED      = "call_missed"
-    SYSTEM_ALERT     = "system_alert"
-    SYSTEM_UP        = "system_up"
-    NODE_OFFLINE     = "node_offline"
-    NODE_ONLINE      = "node_online"
-    HEALTH_WARNING   = "health_warning"
-    SECURITY_EVENT   = "security_event"
-    MOTION_DETECTED  = "motion_detected"
-    DAILY_DIGEST     = "daily_digest"
-    WEEKLY_SUMMARY   = "weekly_summary"
-    INFO             = "info"
-    WARNING          = "warning"
-    ERROR            = "error"
-
-
-DEFAULT_PRIORITIES = {
-    NotificationType.TASK_COMPLETE:     Priority.NORMAL,
-    NotificationType.TASK_FAILED:       Priority.HIGH,
-    NotificationType.CLAWWORK_EARNINGS: Priority.LOW,
-    NotificationType.CLAWWORK_PAUSED:   Priority.NORMAL,
-    NotificationType.CLAWWORK_RESUMED:  Priority.NORMAL,
-    NotificationType.CALL_RECEIVED:     Priority.HIGH,
-    NotificationType.CALL_MISSED:       Priority.HIGH,
-    NotificationType.SYSTEM_ALERT:      Priority.CRITICAL,
-    NotificationType.SYSTEM_UP:         Priority.NORMAL,
-    NotificationType.NODE_OFFLINE:      Priority.CRITICAL,
-    NotificationType.NODE_ONLINE:       Priority.NORMAL,
-    NotificationType.HEALTH_WARNING:    Priority.HIGH,
-    NotificationType.SECURITY_EVENT:    Priority.CRITICAL,
-    NotificationType.MOTION_DETECTED:   Priority.HIGH,
-    NotificationType.DAILY_DIGEST:      Priority.NORMAL,
-    NotificationType.WEEKLY_SUMMARY:    Priority.NORMAL,
-    NotificationType.INFO:              Priority.LOW,
-    NotificationType.WARNING:           Priority.HIGH,
-    NotificationType.ERROR:             Priority.CRITICAL,
+    """Value is the wire name; each member also carries its default priority and icon."""
+
+    def __new__(cls, value: str, default_priority: Priority, icon: str):
+        obj = object.__new__(cls)
+        obj._value_ = value
+        obj.default_priority = default_priority
+        obj.icon = icon
+        return obj
+
+    TASK_COMPLETE     = ("task_complete",      Priority.NORMAL,   "✅")
+    TASK_FAILED       = ("task_failed",        Priority.HIGH,     "❌")
+    CLAWWORK_EARNINGS = ("clawwork_earnings",  Priority.LOW,      "💰")
+    CLAWWORK_PAUSED   = ("clawwork_paused",    Priority.NORMAL,   "⏸")
+    CLAWWORK_RESUMED  = ("clawwork_resumed",   Priority.NORMAL,   "▶️")
+    CALL_RECEIVED     = ("call_received",      Priority.HIGH,     "📞")
+    CALL_MISSED       = ("call_missed",        Priority.HIGH,     "📵")
+    SYSTEM_ALERT      = ("system_alert",       Priority.CRITICAL, "🚨")
+    SYSTEM_UP         = ("system_up",          Priority.NORMAL,   "🟢")
+    NODE_OFFLINE      = ("node_offline",       Priority.CRITICAL, "🔴")
+    NODE_ONLINE       = ("node_online",        Priority.NORMAL,   "🟢")
+    HEALTH_WARNING    = ("health_warning",     Priority.HIGH,     "⚠️")
+    SECURITY_EVENT    = ("security_event",     Priority.CRITICAL, "🔒")
+    MOTION_DETECTED   = ("motion_detected",    Priority.HIGH,     "👀")
+    DAILY_DIGEST      = ("daily_digest",       Priority.NORMAL,   "☀️")
+    WEEKLY_SUMMARY    = ("weekly_summary",     Priority.NORMAL,   "📈")
+    INFO              = ("info",               Priority.LOW,      "ℹ️")
+    WARNING           = ("warning",            Priority.HIGH,     "⚠️")
+    ERROR             = ("error",              Priority.CRITICAL, "🔴")
+
+
+_BADGE_BY_PRIORITY = {
+    Priority.CRITICAL: "🚨 *CRITICAL* ",
+    Priority.HIGH:     "⚠️ ",
+    Priority.NORMAL:   "",
+    Priority.LOW:      "",
 }
 
-TYPE_ICONS = {
-    NotificationType.TASK_COMPLETE:     "✅",
-    NotificationType.TASK_FAILED:       "❌",
-    NotificationType.CLAWWORK_EARNINGS: "💰",
-    NotificationType.CLAWWORK_PAUSED:   "⏸",
-    NotificationType.CLAWWORK_RESUMED:  "▶️",
-    NotificationType.CALL_RECEIVED:     "📞",
-    NotificationType.CALL_MISSED:       "📵",
-    NotificationType.SYSTEM_ALERT:      "🚨",
-    NotificationType.SYSTEM_UP:         "🟢",
-    NotificationType.NODE_OFFLINE:      "🔴",
-    NotificationType.NODE_ONLINE:       "🟢",
-    NotificationType.HEALTH_WARNING:    "⚠️",
-    NotificationType.SECURITY_EVENT:    "🔒",
-    NotificationType.MOTION_DETECTED:   "👀",
-    NotificationType.DAILY_DIGEST:      "☀️",
-    NotificationType.WEEKLY_SUMMARY:    "📈",
-    NotificationType.INFO:              "ℹ️",
-    NotificationType.WARNING:           "⚠️",
-    NotificationType.ERROR:             "🔴",
-}
+DEFAULT_CONFIG_PATH = Path(__file__).parent / "bot_config.json"
+
+
+@lru_cache(maxsize=8)
+def load_config(path: Path = DEFAULT_CONFIG_PATH) -> dict:
+    """
+    Parsed bot_config.json, memoized per path ({} if missing). Shared by
+    daily_digest and every NotificationManager — treat the result as read-only.
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(Path(path).read_bytes())
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+OUTBOX_BATCH = 10          # max notifications drained per worker pass
+OUTBOX_WINDOW = 0.25       # seconds to wait for more items before sending
+TELEGRAM_MAX_TEXT = 4096
+
+
+@lru_cache(maxsize=None)
+def _prefix_hasher(notif_type: NotificationType):
+    """MD5 state pre-fed with the "<type>::" prefix; copy() it per key."""
+    return hashlib.md5(f"{notif_type.value}::".encode())
 
 
 class DedupeCache:
-    def __init__(self, ttl_seconds: int = 300):
-        self._cache: dict = {}
+    def __init__(self, ttl_seconds: int = 300, maxlen: int = 4096):
+        # Insertion order == send order, so expired entries are always at the
+        # front and eviction is amortized O(1) — no full-dict rebuild per send.
+        self._cache: "OrderedDict[str, float]" = OrderedDict()
         self.ttl = ttl_seconds
+        self.maxlen = maxlen
 
     def _key(self, notif_type: NotificationType, message: str) -> str:
-        raw = f"{notif_type.value}::{message[:100]}"
-        return hashlib.md5(raw.encode()).hexdigest()
+        h = _prefix_hasher(notif_type).copy()
+        h.update(message[:100].encode())
+        return h.hexdigest()
 
     def is_duplicate(self, notif_type: NotificationType, message: str) -> bool:
         key = self._key(notif_type, message)
-        now = time.time()
-        if key in self._cache:
-            if now - self._cache[key] < self.ttl:
-                return True
+        sent_at = self._cache.get(key)
+        if sent_at is None:
+            return False
+        if time.time() - sent_at < self.ttl:
+            return True
+        del self._cache[key]
         return False
 
+    def forget(self, notif_type: NotificationType, message: str):
+        self._cache.pop(self._key(notif_type, message), None)
+
     def mark_sent(self, notif_type: NotificationType, message: str):
         key = self._key(notif_type, message)
-        self._cache[key] = time.time()
         now = time.time()
-        self._cache = {k: v for k, v in self._cache.items() if now - v < self.ttl}
+        self._cache[key] = now
+        self._cache.move_to_end(key)
+        cache = self._cache
+        while cache and (len(cache) > self.maxlen or now - next(iter(cache.values())) >= self.ttl):
+            cache.popitem(last=False)
 
 
 class NotificationManager:
@@ -146,12 +171,7 @@ class NotificationManager:
         self.bot_token = bot_token or os.getenv("TELEGRAM_BOT_TOKEN", "")
         self.owner_chat_id = owner_chat_id or int(os.getenv("TELEGRAM_OWNER_CHAT_ID", "0"))
 
-        config_path = config_path or (Path(__file__).parent / "bot_config.json")
-        try:
-            with open(config_path) as f:
-                self._config = json.load(f)
-        except FileNotFoundError:
-            self._config = {}
+        self._config = load_config(Path(config_path or DEFAULT_CONFIG_PATH))
 
         self._quiet_start = self._parse_time(self._config.get("quiet_hours", {}).get("start", "22:00"))
         self._quiet_end   = self._parse_time(self._config.get("quiet_hours", {}).get("end",   "07:00"))
@@ -161,10 +181,22 @@ class NotificationManager:
         self._retry_delay    = self._config.get("retry_delay_seconds", 5)
         self._batch_queue: list = []
         self._bot = None
+        self._outbox: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
 
     def _get_bot(self) -> Bot:
         if not self._bot:
-            self._bot = Bot(token=self.bot_token)
+            # Explicit pool so bursts (outbox batches, flush_batch) reuse
+            # keep-alive connections to api.telegram.org.
+            self._bot = Bot(
+                token=self.bot_token,
+                request=HTTPXRequest(
+                    connection_pool_size=16,
+                    read_timeout=10,
+                    write_timeout=10,
+                    pool_timeout=5,
+                ),
+            )
         return self._bot
 
     @staticmethod
@@ -175,23 +207,20 @@ class NotificationManager:
         except Exception:
             return dtime(22, 0)
 
-    def _in_quiet_hours(self) -> bool:
+    def _in_quiet_hours(self, now: Optional[datetime] = None) -> bool:
         if not self._quiet_enabled:
             return False
-        now = datetime.now().time().replace(second=0, microsecond=0)
+        t = (now or datetime.now()).time().replace(second=0, microsecond=0)
         qs, qe = self._quiet_start, self._quiet_end
         if qs > qe:
-            return now >= qs or now < qe
-        return qs <= now < qe
+            return t >= qs or t < qe
+        return qs <= t < qe
 
-    def _should_suppress(self, priority: Priority) -> bool:
-        if priority == Priority.CRITICAL:
-            return False
-        if priority == Priority.HIGH and not self._in_quiet_hours():
+    def _should_suppress(self, priority: Priority, now: Optional[datetime] = None) -> bool:
+        if priority == Priority.CRITICAL or priority == Priority.HIGH:
             return False
-        if self._in_quiet_hours() and priority in (Priority.NORMAL, Priority.LOW):
-            return True
-        return False
+        # Only NORMAL/LOW are held, so the clock is read at most once per send.
+        return self._in_quiet_hours(now)
 
     def _format_message(
         self,
@@ -200,14 +229,11 @@ class NotificationManager:
         priority: Priority,
         title: Optional[str] = None,
         context: Optional[dict] = None,
+        now: Optional[datetime] = None,
     ) -> str:
-        icon = TYPE_ICONS.get(notif_type, "\u2022")
-        ts = datetime.now().strftime("%H:%M")
-        badge = ""
-        if priority == Priority.CRITICAL:
-            badge = "🚨 *CRITICAL* "
-        elif priority == Priority.HIGH:
-            badge = "⚠️ "
+        icon = notif_type.icon
+        ts = f"{now or datetime.now():%H:%M}"
+        badge = _BADGE_BY_PRIORITY[priority]
         header = f"{badge}{icon} *{title}*" if title else f"{badge}{icon}"
         body = f"{header}\n{message}"
         if context:
@@ -226,19 +252,27 @@ class NotificationManager:
         photo_bytes: Optional[bytes] = None,
         chat_id: Optional[int] = None,
         deduplicate: bool = True,
+        wait: bool = False,
     ) -> bool:
+        """
+        Send a notification. CRITICAL messages are delivered immediately; others
+        go through the outbox, and the return value only confirms they were
+        queued unless wait=True, which returns the actual delivery result.
+        A failed delivery is removed from the dedupe cache so it can be resent.
+        """
         if not self.bot_token:
             logger.error("No bot token set — cannot send notification.")
             return False
 
-        priority = priority or DEFAULT_PRIORITIES.get(notif_type, Priority.NORMAL)
+        priority = priority or notif_type.default_priority
         target_chat_id = chat_id or self.owner_chat_id
 
         if deduplicate and self._dedupe.is_duplicate(notif_type, message):
             logger.debug(f"Deduplicated {notif_type.value}: {message[:60]}")
             return False
 
-        if self._should_suppress(priority):
+        now = datetime.now()
+        if self._should_suppress(priority, now):
             logger.debug(f"Suppressed during quiet hours: {notif_type.value}")
             if priority == Priority.LOW:
                 self._batch_queue.append({
@@ -247,26 +281,43 @@ class NotificationManager:
                 })
             return False
 
-        formatted = self._format_message(notif_type, message, priority, title, context)
+        formatted = self._format_message(notif_type, message, priority, title, context, now)
 
+        if priority == Priority.CRITICAL:
+            # Fast path: critical alerts never wait behind the outbox.
+            ok = await self._deliver(target_chat_id, formatted, photo_bytes)
+            if ok:
+                self._dedupe.mark_sent(notif_type, message)
+                logger.info(f"Sent [{priority.name}] {notif_type.value}: {message[:80]}")
+            return ok
+
+        # Mark at enqueue time so repeats arriving while this one is queued dedupe
+        # too; the worker forgets the entry again if delivery fails.
+        self._dedupe.mark_sent(notif_type, message)
+        self._ensure_worker()
+        delivered = asyncio.get_running_loop().create_future()
+        self._outbox.put_nowait((notif_type, target_chat_id, formatted, photo_bytes, message, delivered))
+        if wait:
+            return await delivered
+        return True
+
+    async def _deliver(self, chat_id: int, text: str, photo_bytes: Optional[bytes] = None) -> bool:
         for attempt in range(1, self._retry_attempts + 1):
             try:
                 bot = self._get_bot()
                 if photo_bytes:
                     await bot.send_photo(
-                        chat_id=target_chat_id,
+                        chat_id=chat_id,
                         photo=InputFile(photo_bytes, filename="snapshot.jpg"),
-                        caption=formatted,
+                        caption=text,
                         parse_mode=ParseMode.MARKDOWN,
                     )
                 else:
                     await bot.send_message(
-                        chat_id=target_chat_id,
-                        text=formatted,
+                        chat_id=chat_id,
+                        text=text,
                         parse_mode=ParseMode.MARKDOWN,
                     )
-                self._dedupe.mark_sent(notif_type, message)
-                logger.info(f"Sent [{priority.name}] {notif_type.value}: {message[:80]}")
                 return True
             except TelegramError as e:
                 logger.warning(f"Telegram send attempt {attempt}/{self._retry_attempts} failed: {e}")
@@ -279,6 +330,87 @@ class NotificationManager:
         logger.error(f"Failed to send notification after {self._retry_attempts} attempts.")
         return False
 
+    # ── Outbox ───────────────────────────────────
+
+    def _ensure_worker(self):
+        if self._outbox is None:
+            self._outbox = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._outbox_worker())
+
+    async def _outbox_worker(self):
+        """
+        Drain the outbox in batches of up to OUTBOX_BATCH items, waiting at most
+        OUTBOX_WINDOW for stragglers. Consecutive text notifications of the same
+        type to the same chat are coalesced into a single Telegram message.
+        """
+        loop = asyncio.get_running_loop()
+        q = self._outbox
+        while True:
+            batch = [await q.get()]
+            deadline = loop.time() + OUTBOX_WINDOW
+            while len(batch) < OUTBOX_BATCH:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(q.get(), remaining))
+                except TimeoutError:
+                    break
+            try:
+                for (notif_type, chat_id, has_photo), group in groupby(
+                    batch, key=lambda item: (item[0], item[1], item[3] is not None)
+                ):
+                    group = list(group)
+                    if has_photo:
+                        for item in group:
+                            self._settle([item], await self._deliver(chat_id, item[2], item[3]))
+                        continue
+                    for text, items in self._coalesce(group):
+                        self._settle(items, await self._deliver(chat_id, text))
+                    logger.info(f"Sent {len(group)}x {notif_type.value}")
+            except Exception as e:
+                logger.error(f"Outbox worker error: {e}", exc_info=True)
+            finally:
+                # Anything not settled above (worker error/cancel) counts as failed
+                self._settle(batch, False)
+                for _ in batch:
+                    q.task_done()
+
+    def _settle(self, items, ok: bool):
+        """Resolve delivery futures; failed messages leave the dedupe cache."""
+        for notif_type, _, _, _, message, delivered in items:
+            if delivered.done():
+                continue
+            if not ok:
+                self._dedupe.forget(notif_type, message)
+            delivered.set_result(ok)
+
+    @staticmethod
+    def _coalesce(items):
+        """
+        Join queued notifications into as few messages as Telegram's size limit
+        allows. Yields (text, items) so each message's result maps back to its items.
+        """
+        chunk, members = "", []
+        for item in items:
+            text = item[2]
+            if chunk and len(chunk) + 2 + len(text) > TELEGRAM_MAX_TEXT:
+                yield chunk, members
+                chunk, members = "", []
+            chunk = f"{chunk}\n\n{text}" if chunk else text
+            members.append(item)
+        if chunk:
+            yield chunk, members
+
+    async def drain(self):
+        """Wait until everything queued by send() has been delivered."""
+        if self._outbox is not None:
+            await self._outbox.join()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
     async def task_complete(self, task_name: str, client: Optional[str] = None, duration: Optional[str] = None):
         ctx = {}
         if client: ctx["Client"] = client
@@ -313,7 +445,7 @@ class NotificationManager:
         await self.send(notif_type=NotificationType.SECURITY_EVENT, message=description, title="Security Alert", context=ctx if ctx else None, priority=Priority.CRITICAL, photo_bytes=photo)
 
     async def motion_detected(self, camera: str, photo: Optional[bytes] = None):
-        await self.send(notif_type=NotificationType.MOTION_DETECTED, message=f"Motion detected at *{camera}*", context={"Camera": camera, "Time": datetime.now().strftime("%H:%M:%S")}, photo_bytes=photo)
+        await self.send(notif_type=NotificationType.MOTION_DETECTED, message=f"Motion detected at *{camera}*", context={"Camera": camera, "Time": f"{datetime.now():%H:%M:%S}"}, photo_bytes=photo)
 
     async def system_alert(self, description: str, context: Optional[dict] = None):
         await self.send(notif_type=NotificationType.SYSTEM_ALERT, message=description, title="System Alert", context=context, priority=Priority.CRITICAL)
@@ -329,19 +461,18 @@ class NotificationManager:
     async def flush_batch(self):
         if not self._batch_queue:
             return
-        logger.info(f"Flushing {len(self._batch_queue)} batched notifications.")
-        summary_lines = ["📦 *Held notifications from quiet hours:*\n"]
-        for item in self._batch_queue:
-            icon = TYPE_ICONS.get(item["type"], "\u2022")
-            summary_lines.append(f"{icon} {item['message']}")
-        summary_lines.append(f"\n_Total: {len(self._batch_queue)} notifications_")
+        queued, self._batch_queue = self._batch_queue, []
+        logger.info(f"Flushing {len(queued)} batched notifications.")
+        text = "\n".join(chain(
+            ("📦 *Held notifications from quiet hours:*\n",),
+            (f"{item['type'].icon} {item['message']}" for item in queued),
+            (f"\n_Total: {len(queued)} notifications_",),
+        ))
         bot = self._get_bot()
         try:
-            await bot.send_message(chat_id=self.owner_chat_id, text="\n".join(summary_lines), parse_mode=ParseMode.MARKDOWN)
+            await bot.send_message(chat_id=self.owner_chat_id, text=text, parse_mode=ParseMode.MARKDOWN)
         except TelegramError as e:
             logger.error(f"Failed to flush batch: {e}")
-        finally:
-            self._batch_queue.clear()
 
 
 async def _cli_send(notif_type: str, message: str, priority_str: str = "NORMAL"):
@@ -354,7 +485,8 @@ async def _cli_send(notif_type: str, message: str, priority_str: str = "NORMAL")
         p = Priority[priority_str.upper()]
     except KeyError:
         p = Priority.NORMAL
-    success = await nm.send(nt, message, priority=p)
+    success = await nm.send(nt, message, priority=p, wait=True)
+    await nm.drain()
     print("Sent." if success else "Failed.")
 
 
@@ -24,18 +24,24 @@ Requires env vars:
 Optional env vars:
   OPENCLAW_API_URL        - base URL for OpenClaw REST API (default http://localhost:8080)
   OPENCLAW_API_KEY        - API key if OpenClaw auth is enabled
+  HISTORY_BACKEND         - "jsonl" (append-only file per chat, default) or "sqlite";
+                            jsonl imports a chat's existing SQLite history on first use
+  HISTORY_DIR             - directory for per-chat JSONL history (default data/history)
   HISTORY_DB              - path to SQLite file for chat history (default data/telegram_history.db)
   MAX_HISTORY_TURNS       - conversation turns to keep per user (default 20)
+  OPENCLAW_CACHE_TTL      - seconds to reuse OpenClaw GET responses (default 2.0, 0 disables)
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import os
 import sqlite3
-import textwrap
-from datetime import datetime, timezone
+import threading
+import time
+from collections import deque
 from pathlib import Path
 from typing import Optional
 
@@ -51,6 +57,11 @@ from telegram.ext import (
     filters,
 )
 
+try:
+    import orjson  # optional — faster encode/decode of OpenClaw chat payloads
+except ImportError:
+    orjson = None
+
 # ---------------------------------------------------------------------------
 # Bootstrap
 # ---------------------------------------------------------------------------
@@ -66,61 +77,183 @@ BOT_TOKEN: str = os.environ["TELEGRAM_BOT_TOKEN"]
 OWNER_ID: int = int(os.environ["TELEGRAM_OWNER_CHAT_ID"])
 OPENCLAW_URL: str = os.getenv("OPENCLAW_API_URL", "http://localhost:8080")
 OPENCLAW_KEY: Optional[str] = os.getenv("OPENCLAW_API_KEY")
+HISTORY_BACKEND: str = os.getenv("HISTORY_BACKEND", "jsonl").lower()
+HISTORY_DIR: Path = Path(os.getenv("HISTORY_DIR", "data/history"))
 HISTORY_DB: Path = Path(os.getenv("HISTORY_DB", "data/telegram_history.db"))
 MAX_HISTORY: int = int(os.getenv("MAX_HISTORY_TURNS", "20"))
 
 _silenced: bool = False
 
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_dumpb = orjson.dumps
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+    def _json_dumpb(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+
 # ---------------------------------------------------------------------------
-# SQLite conversation history
+# Conversation history (JSONL files, or SQLite with HISTORY_BACKEND=sqlite)
 # ---------------------------------------------------------------------------
 
-def _db() -> sqlite3.Connection:
-    HISTORY_DB.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(HISTORY_DB)
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS history (
-            id       INTEGER PRIMARY KEY AUTOINCREMENT,
-            chat_id  INTEGER NOT NULL,
-            role     TEXT    NOT NULL,
-            content  TEXT    NOT NULL,
-            ts       TEXT    NOT NULL
-        )
-        """
-    )
-    conn.commit()
-    return conn
+_CONN: Optional[sqlite3.Connection] = None
+_DB_LOCK = threading.Lock()
+# Write-through cache of each chat's retained window (same rows SQLite keeps),
+# so a chat turn's read after its own append doesn't go back to the DB.
+_history_cache: dict[int, deque] = {}
 
+# Hot-path SQL as module constants: the identical str objects are what the
+# connection's statement cache is keyed on, so each is prepared only once.
+_SQL_INSERT = "INSERT INTO history (chat_id, role, content, ts) VALUES (?,?,?,?)"
+_SQL_CUTOFF = "SELECT id FROM history WHERE chat_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?"
+_SQL_TRIM = "DELETE FROM history WHERE chat_id = ? AND id <= ?"
+_SQL_SELECT = "SELECT role, content FROM history WHERE chat_id = ? ORDER BY id DESC LIMIT ?"
 
-def history_append(chat_id: int, role: str, content: str) -> None:
-    with _db() as conn:
-        conn.execute(
-            "INSERT INTO history (chat_id, role, content, ts) VALUES (?,?,?,?)",
-            (chat_id, role, content, datetime.now(timezone.utc).isoformat()),
-        )
+
+def _db() -> sqlite3.Connection:
+    """Long-lived autocommit connection in WAL mode; schema is created once on first use."""
+    global _CONN
+    if _CONN is None:
+        HISTORY_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(HISTORY_DB, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
         conn.execute(
             """
-            DELETE FROM history
-            WHERE chat_id = ? AND id NOT IN (
-                SELECT id FROM history WHERE chat_id = ?
-                ORDER BY id DESC LIMIT ?
+            CREATE TABLE IF NOT EXISTS history (
+                id       INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id  INTEGER NOT NULL,
+                role     TEXT    NOT NULL,
+                content  TEXT    NOT NULL,
+                ts       INTEGER NOT NULL  -- unix epoch ms
             )
-            """,
-            (chat_id, chat_id, MAX_HISTORY * 2),
+            """
         )
-        conn.commit()
+        # Serves both the per-chat read (ORDER BY id) and the trim (ORDER BY id DESC).
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_history_chat_id ON history(chat_id, id DESC)")
+        _CONN = conn
+    return _CONN
 
 
-def history_get(chat_id: int) -> list[dict]:
-    with _db() as conn:
-        rows = conn.execute(
-            "SELECT role, content FROM history WHERE chat_id = ? ORDER BY id ASC",
-            (chat_id,),
-        ).fetchall()
+def _sqlite_append(chat_id: int, role: str, content: str) -> None:
+    conn = _db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(_SQL_INSERT, (chat_id, role, content, time.time_ns() // 1_000_000))
+        # Keyset trim: seek to the oldest id we keep via the (chat_id, id DESC)
+        # index and drop everything at or below it — no NOT IN materialization.
+        cutoff = conn.execute(_SQL_CUTOFF, (chat_id, MAX_HISTORY * 2)).fetchone()
+        if cutoff:
+            conn.execute(_SQL_TRIM, (chat_id, cutoff[0]))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _sqlite_load(chat_id: int) -> list[dict]:
+    rows = _db().execute(_SQL_SELECT, (chat_id, MAX_HISTORY * 2)).fetchall()
+    rows.reverse()
     return [{"role": r, "content": c} for r, c in rows]
 
 
+# JSONL backend: one append-only file per chat, one write() per turn. A file is
+# compacted back to the retained window once it holds twice that many lines.
+_jsonl_lines: dict[int, int] = {}
+
+
+def _jsonl_path(chat_id: int) -> Path:
+    return HISTORY_DIR / f"{chat_id}.jsonl"
+
+
+def _jsonl_import_sqlite(chat_id: int, path: Path) -> list[dict]:
+    """Seed a chat's missing JSONL file from the SQLite history left by older installs."""
+    if not HISTORY_DB.exists():
+        return []
+    try:
+        rows = _sqlite_load(chat_id)
+    except sqlite3.Error as e:
+        log.warning("Could not import SQLite history for chat %s: %s", chat_id, e)
+        return []
+    if rows:
+        HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".jsonl.tmp")
+        with open(tmp, "wb") as f:
+            f.writelines(_json_dumpb(row) + b"\n" for row in rows)
+        os.replace(tmp, path)
+        log.info("Imported %d history rows for chat %s from %s", len(rows), chat_id, HISTORY_DB)
+    return rows
+
+
+def _jsonl_append(chat_id: int, role: str, content: str) -> None:
+    path = _jsonl_path(chat_id)
+    if chat_id not in _jsonl_lines:
+        HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(path, "rb") as f:
+                _jsonl_lines[chat_id] = sum(1 for _ in f)
+        except FileNotFoundError:
+            _jsonl_lines[chat_id] = len(_jsonl_import_sqlite(chat_id, path))
+    with open(path, "ab") as f:
+        f.write(_json_dumpb({"role": role, "content": content}) + b"\n")
+    _jsonl_lines[chat_id] += 1
+    if _jsonl_lines[chat_id] > MAX_HISTORY * 4:
+        with open(path, "rb") as f:
+            tail = deque(f, maxlen=MAX_HISTORY * 2)
+        tmp = path.with_suffix(".jsonl.tmp")
+        with open(tmp, "wb") as f:
+            f.writelines(tail)
+        os.replace(tmp, path)
+        _jsonl_lines[chat_id] = len(tail)
+
+
+def _jsonl_load(chat_id: int) -> list[dict]:
+    path = _jsonl_path(chat_id)
+    try:
+        with open(path, "rb") as f:
+            tail = deque(f, maxlen=MAX_HISTORY * 2)
+    except FileNotFoundError:
+        return _jsonl_import_sqlite(chat_id, path)
+    rows = []
+    for line in tail:
+        if not line.strip():
+            continue
+        try:
+            rows.append(_json_loads(line))
+        except ValueError:
+            # A crash mid-write leaves a truncated line; drop it rather than the chat.
+            log.warning("Skipping corrupt history line in %s", path)
+    return rows
+
+
+def history_append(chat_id: int, role: str, content: str) -> None:
+    with _DB_LOCK:
+        if HISTORY_BACKEND == "sqlite":
+            _sqlite_append(chat_id, role, content)
+        else:
+            _jsonl_append(chat_id, role, content)
+        cached = _history_cache.get(chat_id)
+        if cached is not None:
+            cached.append({"role": role, "content": content})
+
+
+def history_get(chat_id: int) -> list[dict]:
+    with _DB_LOCK:
+        cached = _history_cache.get(chat_id)
+        if cached is None:
+            rows = _sqlite_load(chat_id) if HISTORY_BACKEND == "sqlite" else _jsonl_load(chat_id)
+            cached = _history_cache[chat_id] = deque(rows, maxlen=MAX_HISTORY * 2)
+        return list(cached)
+
+
 # ---------------------------------------------------------------------------
 # OpenClaw API helpers
 # ---------------------------------------------------------------------------
@@ -129,23 +262,83 @@ AUTH_HEADERS: dict[str, str] = (
     {"X-API-Key": OPENCLAW_KEY} if OPENCLAW_KEY else {}
 )
 
+_GET_TIMEOUT = aiohttp.ClientTimeout(total=15)
+_POST_TIMEOUT = aiohttp.ClientTimeout(total=60)
+
+# One pooled session for the life of the bot, so every command reuses
+# keep-alive connections instead of paying TCP/TLS setup per request.
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            headers=AUTH_HEADERS,
+            timeout=_POST_TIMEOUT,
+            json_serialize=_json_dumps,
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=75),
+        )
+    return _SESSION
+
+
+async def _close_session() -> None:
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
+# Short-lived GET cache: a burst of /status, /health, /nodes within the TTL
+# shares one upstream call. Any POST clears it, since it may change state.
+_OC_CACHE_TTL: float = float(os.getenv("OPENCLAW_CACHE_TTL", "2.0"))
+_oc_cache: dict[object, tuple[float, dict]] = {}
+
+
+def _oc_cached(key: object) -> Optional[dict]:
+    hit = _oc_cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < _OC_CACHE_TTL:
+        return hit[1]
+    return None
+
 
 async def _oc_get(path: str) -> dict:
-    async with aiohttp.ClientSession(headers=AUTH_HEADERS) as session:
-        async with session.get(f"{OPENCLAW_URL}{path}", timeout=aiohttp.ClientTimeout(total=15)) as resp:
-            resp.raise_for_status()
-            return await resp.json()
+    data = _oc_cached(path)
+    if data is not None:
+        return data
+    session = await _get_session()
+    async with session.get(f"{OPENCLAW_URL}{path}", timeout=_GET_TIMEOUT) as resp:
+        resp.raise_for_status()
+        data = await resp.json(loads=_json_loads)
+    _oc_cache[path] = (time.monotonic(), data)
+    return data
+
+
+async def _oc_get_fields(path: str, keys: tuple[str, ...]) -> dict:
+    """
+    GET for commands that only read a few top-level keys: parse the raw body
+    bytes directly (orjson takes bytes, skipping aiohttp's text decode) and
+    keep only `keys`.
+    """
+    cache_key = (path, keys)
+    fields = _oc_cached(cache_key)
+    if fields is not None:
+        return fields
+    session = await _get_session()
+    async with session.get(f"{OPENCLAW_URL}{path}", timeout=_GET_TIMEOUT) as resp:
+        resp.raise_for_status()
+        data = _json_loads(await resp.read())
+    fields = {k: data[k] for k in keys if k in data}
+    _oc_cache[cache_key] = (time.monotonic(), fields)
+    return fields
 
 
 async def _oc_post(path: str, payload: dict) -> dict:
-    async with aiohttp.ClientSession(headers=AUTH_HEADERS) as session:
-        async with session.post(
-            f"{OPENCLAW_URL}{path}",
-            json=payload,
-            timeout=aiohttp.ClientTimeout(total=60),
-        ) as resp:
-            resp.raise_for_status()
-            return await resp.json()
+    _oc_cache.clear()
+    session = await _get_session()
+    async with session.post(f"{OPENCLAW_URL}{path}", json=payload, timeout=_POST_TIMEOUT) as resp:
+        resp.raise_for_status()
+        return await resp.json(loads=_json_loads)
 
 
 # ---------------------------------------------------------------------------
@@ -153,10 +346,47 @@ async def _oc_post(path: str, payload: dict) -> dict:
 # ---------------------------------------------------------------------------
 
 def _chunk(text: str, size: int = 4000) -> list[str]:
-    return textwrap.wrap(text, size, break_long_words=True, replace_whitespace=False)
+    # Telegram's limit is per character, so a plain slice is enough; most
+    # replies fit in one message and skip the loop entirely.
+    if len(text) <= size:
+        return [text] if text.strip() else []
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _md_code(value) -> str:
+    """Markdown code span for arbitrary text; a stray backtick would make Telegram reject the message."""
+    return "`" + str(value).replace("`", "ʻ") + "`"
+
+
+_bg_tasks: set[asyncio.Task] = set()
+
+
+def _typing_soon(update: Update) -> None:
+    """
+    Fire-and-forget typing indicator for quick commands, so the Telegram
+    round-trip overlaps the OpenClaw call instead of preceding it. Slow agent
+    calls (/ask, /chat, free text) still await it directly.
+    """
+    task = asyncio.create_task(update.message.chat.send_action(ChatAction.TYPING))
+    _bg_tasks.add(task)
+    task.add_done_callback(_typing_done)
+
+
+def _typing_done(task: asyncio.Task) -> None:
+    _bg_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        log.debug("send_action failed: %s", task.exception())
 
 
-async def _reply(update: Update, text: str, parse_mode: str = ParseMode.MARKDOWN) -> None:
+async def _reply_fast(update: Update, text: str, parse_mode: Optional[str] = None) -> None:
+    """Single send for replies known to fit in one message (static/usage text)."""
+    await update.message.reply_text(text, parse_mode=parse_mode)
+
+
+async def _reply(update: Update, text: str, parse_mode: Optional[str] = None) -> None:
+    """Send possibly-long text. Plain text unless the caller opts into a parse mode."""
+    # Chunks are sent one at a time: Telegram gives no ordering guarantee for
+    # concurrent sends, and a split reply must read top to bottom.
     for chunk in _chunk(text):
         await update.message.reply_text(chunk, parse_mode=parse_mode)
 
@@ -165,45 +395,53 @@ async def _reply(update: Update, text: str, parse_mode: str = ParseMode.MARKDOWN
 # /start
 # ---------------------------------------------------------------------------
 
+# Static text is pre-rendered as HTML: no Markdown to escape, cheap to parse.
+_START_TEXT = (
+    "<b>Bob the Conductor</b>\n\n"
+    "I'm the control interface for your AI Server.\n"
+    "Type /help to see what I can do."
+)
+
+
 async def cmd_start(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
-    text = (
-        "*Bob the Conductor*\n\n"
-        "I'm the control interface for your AI Server.\n"
-        "Type /help to see what I can do."
-    )
-    await _reply(update, text)
+    await _reply_fast(update, _START_TEXT, parse_mode=ParseMode.HTML)
 
 
 # ---------------------------------------------------------------------------
 # /help
 # ---------------------------------------------------------------------------
 
+_HELP_TEXT = (
+    "<b>Available commands</b>\n\n"
+    "<code>/status</code>      - System overview\n"
+    "<code>/health</code>      - Detailed node health\n"
+    "<code>/nodes</code>       - Worker-node roster\n"
+    "<code>/tasks</code>       - Task queue\n"
+    "<code>/logs [n]</code>    - Last n log lines (default 20)\n"
+    "<code>/earnings</code>    - Earnings summary\n"
+    "<code>/ask &lt;q&gt;</code>     - One-shot question\n"
+    "<code>/chat &lt;msg&gt;</code>  - Conversation (remembers context)\n"
+    "<code>/restart &lt;s&gt;</code> - Restart service (owner only)\n"
+    "<code>/silence</code>     - Mute notifications\n"
+    "<code>/unsilence</code>   - Re-enable notifications\n"
+)
+
+
 async def cmd_help(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
-    text = (
-        "*Available commands*\n\n"
-        "`/status`      - System overview\n"
-        "`/health`      - Detailed node health\n"
-        "`/nodes`       - Worker-node roster\n"
-        "`/tasks`       - Task queue\n"
-        "`/logs [n]`    - Last n log lines (default 20)\n"
-        "`/earnings`    - Earnings summary\n"
-        "`/ask <q>`     - One-shot question\n"
-        "`/chat <msg>`  - Conversation (remembers context)\n"
-        "`/restart <s>` - Restart service (owner only)\n"
-        "`/silence`     - Mute notifications\n"
-        "`/unsilence`   - Re-enable notifications\n"
-    )
-    await _reply(update, text)
+    await _reply_fast(update, _HELP_TEXT, parse_mode=ParseMode.HTML)
 
 
 # ---------------------------------------------------------------------------
 # /status
 # ---------------------------------------------------------------------------
 
+_STATUS_FIELDS = ("uptime", "cpu_percent", "ram_percent", "disk_percent", "tasks_running", "tasks_queued")
+
+
 async def cmd_status(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
-    await update.message.chat.send_action(ChatAction.TYPING)
+    _typing_soon(update)
     try:
-        data = await _oc_get("/api/v1/status")
+        data = await _oc_get_fields("/api/v1/status", _STATUS_FIELDS)
         uptime = data.get("uptime", "unknown")
         cpu = data.get("cpu_percent", "?")
         ram = data.get("ram_percent", "?")
@@ -217,8 +455,8 @@ async def cmd_status(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
             f"Tasks: `{tasks_running}` running / `{tasks_queued}` queued"
         )
     except Exception as exc:
-        text = f"Could not reach OpenClaw: `{exc}`"
-    await _reply(update, text)
+        text = f"Could not reach OpenClaw: {_md_code(exc)}"
+    await _reply(update, text, parse_mode=ParseMode.MARKDOWN)
 
 
 # ---------------------------------------------------------------------------
@@ -226,7 +464,7 @@ async def cmd_status(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
 # ---------------------------------------------------------------------------
 
 async def cmd_health(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
-    await update.message.chat.send_action(ChatAction.TYPING)
+    _typing_soon(update)
     try:
         data = await _oc_get("/api/v1/health")
         lines = ["*Health Check*\n"]
@@ -237,8 +475,8 @@ async def cmd_health(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
             lines.append(f"{icon} `{svc}`{lat_str}")
         text = "\n".join(lines) or "No health data returned."
     except Exception as exc:
-        text = f"Health check failed: `{exc}`"
-    await _reply(update, text)
+        text = f"Health check failed: {_md_code(exc)}"
+    await _reply(update, text, parse_mode=ParseMode.MARKDOWN)
 
 
 # ---------------------------------------------------------------------------
@@ -246,12 +484,12 @@ async def cmd_health(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
 # ---------------------------------------------------------------------------
 
 async def cmd_nodes(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
-    await update.message.chat.send_action(ChatAction.TYPING)
+    _typing_soon(update)
     try:
         data = await _oc_get("/api/v1/nodes")
         nodes = data.get("nodes", [])
         if not nodes:
-            await _reply(update, "No worker nodes registered.")
+            await _reply_fast(update, "No worker nodes registered.")
             return
         lines = ["*Worker Nodes*\n"]
         for n in nodes:
@@ -260,9 +498,9 @@ async def cmd_nodes(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
                 f"{status_icon} `{n['id']}` - {n.get('role', 'unknown')} "
                 f"| CPU `{n.get('cpu_percent', '?')}%`"
             )
-        await _reply(update, "\n".join(lines))
+        await _reply(update, "\n".join(lines), parse_mode=ParseMode.MARKDOWN)
     except Exception as exc:
-        await _reply(update, f"Nodes unavailable: `{exc}`")
+        await _reply(update, f"Nodes unavailable: {_md_code(exc)}", parse_mode=ParseMode.MARKDOWN)
 
 
 # ---------------------------------------------------------------------------
@@ -270,12 +508,12 @@ async def cmd_nodes(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
 # ---------------------------------------------------------------------------
 
 async def cmd_tasks(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
-    await update.message.chat.send_action(ChatAction.TYPING)
+    _typing_soon(update)
     try:
         data = await _oc_get("/api/v1/tasks")
         tasks = data.get("tasks", [])
         if not tasks:
-            await _reply(update, "Task queue is empty.")
+            await _reply_fast(update, "Task queue is empty.")
             return
         lines = ["*Task Queue*\n"]
         for t in tasks[:20]:
@@ -283,9 +521,9 @@ async def cmd_tasks(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
             lines.append(f"`{t['id']}` - {t.get('name', '?')} ({status})")
         if len(tasks) > 20:
             lines.append(f"...and {len(tasks) - 20} more.")
-        await _reply(update, "\n".join(lines))
+        await _reply(update, "\n".join(lines), parse_mode=ParseMode.MARKDOWN)
     except Exception as exc:
-        await _reply(update, f"Task list unavailable: `{exc}`")
+        await _reply(update, f"Task list unavailable: {_md_code(exc)}", parse_mode=ParseMode.MARKDOWN)
 
 
 # ---------------------------------------------------------------------------
@@ -293,7 +531,7 @@ async def cmd_tasks(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
 # ---------------------------------------------------------------------------
 
 async def cmd_logs(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
-    await update.message.chat.send_action(ChatAction.TYPING)
+    _typing_soon(update)
     try:
         n = int(ctx.args[0]) if ctx.args else 20
         n = max(1, min(n, 100))
@@ -303,25 +541,31 @@ async def cmd_logs(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
         data = await _oc_get(f"/api/v1/logs?lines={n}")
         entries = data.get("entries", [])
         if not entries:
-            await _reply(update, "No log entries found.")
+            await _reply_fast(update, "No log entries found.")
             return
-        body = "\n".join(
-            f"`{e.get('ts', '')[:19]}` [{e.get('level', 'INFO'):5s}] {e.get('msg', '')}"
+        if len(entries) > n:
+            entries = entries[-n:]
+        lines = [
+            f"`{e.get('ts', '')[:19]}` [{e.get('level', 'INFO').ljust(5)}] {e.get('msg', '')}"
             for e in entries
-        )
-        await _reply(update, f"*Last {n} log lines*\n\n" + body)
+        ]
+        body = "\n".join(lines)
+        await _reply(update, f"*Last {n} log lines*\n\n" + body, parse_mode=ParseMode.MARKDOWN)
     except Exception as exc:
-        await _reply(update, f"Logs unavailable: `{exc}`")
+        await _reply(update, f"Logs unavailable: {_md_code(exc)}", parse_mode=ParseMode.MARKDOWN)
 
 
 # ---------------------------------------------------------------------------
 # /earnings
 # ---------------------------------------------------------------------------
 
+_EARNINGS_FIELDS = ("today_usd", "week_usd", "month_usd", "total_usd")
+
+
 async def cmd_earnings(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
-    await update.message.chat.send_action(ChatAction.TYPING)
+    _typing_soon(update)
     try:
-        data = await _oc_get("/api/v1/earnings")
+        data = await _oc_get_fields("/api/v1/earnings", _EARNINGS_FIELDS)
         today = data.get("today_usd", "?")
         week = data.get("week_usd", "?")
         month = data.get("month_usd", "?")
@@ -334,8 +578,8 @@ async def cmd_earnings(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
             f"Total:  `${total}`"
         )
     except Exception as exc:
-        text = f"Earnings unavailable: `{exc}`"
-    await _reply(update, text)
+        text = f"Earnings unavailable: {_md_code(exc)}"
+    await _reply(update, text, parse_mode=ParseMode.MARKDOWN)
 
 
 # ---------------------------------------------------------------------------
@@ -344,16 +588,16 @@ async def cmd_earnings(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
 
 async def cmd_ask(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
     if not ctx.args:
-        await _reply(update, "Usage: `/ask <your question>`")
+        await _reply_fast(update, "Usage: `/ask <your question>`", parse_mode=ParseMode.MARKDOWN)
         return
     question = " ".join(ctx.args)
     await update.message.chat.send_action(ChatAction.TYPING)
     try:
         data = await _oc_post("/api/v1/agent/ask", {"query": question})
         answer = data.get("answer") or data.get("response") or str(data)
-        await _reply(update, answer)
+        await _reply(update, answer, parse_mode=ParseMode.MARKDOWN)
     except Exception as exc:
-        await _reply(update, f"Agent error: `{exc}`")
+        await _reply(update, f"Agent error: {_md_code(exc)}", parse_mode=ParseMode.MARKDOWN)
 
 
 # ---------------------------------------------------------------------------
@@ -362,7 +606,7 @@ async def cmd_ask(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
 
 async def cmd_chat(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
     if not ctx.args:
-        await _reply(update, "Usage: `/chat <message>`")
+        await _reply_fast(update, "Usage: `/chat <message>`", parse_mode=ParseMode.MARKDOWN)
         return
     chat_id = update.effective_chat.id
     user_msg = " ".join(ctx.args)
@@ -375,9 +619,9 @@ async def cmd_chat(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
         )
         answer = data.get("answer") or data.get("response") or str(data)
         history_append(chat_id, "assistant", answer)
-        await _reply(update, answer)
+        await _reply(update, answer, parse_mode=ParseMode.MARKDOWN)
     except Exception as exc:
-        await _reply(update, f"Chat error: `{exc}`")
+        await _reply(update, f"Chat error: {_md_code(exc)}", parse_mode=ParseMode.MARKDOWN)
 
 
 # ---------------------------------------------------------------------------
@@ -386,19 +630,19 @@ async def cmd_chat(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
 
 async def cmd_restart(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
     if update.effective_user.id != OWNER_ID:
-        await _reply(update, "Owner-only command.")
+        await _reply_fast(update, "Owner-only command.")
         return
     if not ctx.args:
-        await _reply(update, "Usage: `/restart <service_name>`")
+        await _reply_fast(update, "Usage: `/restart <service_name>`", parse_mode=ParseMode.MARKDOWN)
         return
     service = ctx.args[0]
-    await update.message.chat.send_action(ChatAction.TYPING)
+    _typing_soon(update)
     try:
         data = await _oc_post("/api/v1/control/restart", {"service": service})
-        msg = data.get("message") or f"Restart issued for `{service}`."
-        await _reply(update, msg)
+        msg = data.get("message") or f"Restart issued for {_md_code(service)}."
+        await _reply(update, msg, parse_mode=ParseMode.MARKDOWN)
     except Exception as exc:
-        await _reply(update, f"Restart failed: `{exc}`")
+        await _reply(update, f"Restart failed: {_md_code(exc)}", parse_mode=ParseMode.MARKDOWN)
 
 
 # ---------------------------------------------------------------------------
@@ -408,13 +652,13 @@ async def cmd_restart(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
 async def cmd_silence(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
     global _silenced
     _silenced = True
-    await _reply(update, "Notifications silenced. Use /unsilence to re-enable.")
+    await _reply_fast(update, "Notifications silenced. Use /unsilence to re-enable.")
 
 
 async def cmd_unsilence(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
     global _silenced
     _silenced = False
-    await _reply(update, "Notifications re-enabled.")
+    await _reply_fast(update, "Notifications re-enabled.")
 
 
 # ---------------------------------------------------------------------------
@@ -435,79 +679,120 @@ async def handle_text(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
         )
         answer = data.get("answer") or data.get("response") or str(data)
         history_append(chat_id, "assistant", answer)
-        await _reply(update, answer)
+        await _reply(update, answer, parse_mode=ParseMode.MARKDOWN)
     except Exception as exc:
-        await _reply(update, f"Error: `{exc}`")
+        await _reply(update, f"Error: {_md_code(exc)}", parse_mode=ParseMode.MARKDOWN)
 
 
 # ---------------------------------------------------------------------------
 # Proactive notification helper
 # ---------------------------------------------------------------------------
 
+_NOTIFY_DEBOUNCE = 0.25     # seconds to collect a burst before sending
+_NOTIFY_SEP = "\n---\n"
+_notify_queue: asyncio.Queue[str] = asyncio.Queue()
+_notify_task: Optional[asyncio.Task] = None
+
+
+def _pack(texts: list[str], sep: str = _NOTIFY_SEP, size: int = 4000) -> list[str]:
+    """Join texts into as few <=size messages as possible, splitting only oversized ones."""
+    out: list[str] = []
+    cur = ""
+    for text in texts:
+        if cur and len(cur) + len(sep) + len(text) <= size:
+            cur = f"{cur}{sep}{text}"
+            continue
+        if cur:
+            out.append(cur)
+        pieces = _chunk(text, size) or [text]
+        out.extend(pieces[:-1])
+        cur = pieces[-1]
+    if cur:
+        out.append(cur)
+    return out
+
+
+async def _notify_worker(app: Application) -> None:
+    """Drain queued notifications, coalescing each burst into as few messages as fit."""
+    while True:
+        texts = [await _notify_queue.get()]
+        await asyncio.sleep(_NOTIFY_DEBOUNCE)
+        while not _notify_queue.empty():
+            texts.append(_notify_queue.get_nowait())
+        for message in _pack(texts):
+            try:
+                await app.bot.send_message(chat_id=OWNER_ID, text=message, parse_mode=ParseMode.MARKDOWN)
+            except Exception as exc:
+                log.warning("Notification send failed: %s", exc)
+
+
 async def send_notification(app: Application, text: str) -> None:
     if _silenced:
         log.info("Notification suppressed (silenced): %s", text[:80])
         return
-    await app.bot.send_message(
-        chat_id=OWNER_ID,
-        text=text,
-        parse_mode=ParseMode.MARKDOWN,
-    )
+    await _notify_queue.put(text)
 
 
 # ---------------------------------------------------------------------------
 # Bot command registration
 # ---------------------------------------------------------------------------
 
-COMMANDS = [
-    BotCommand("start",     "Introduce Bob"),
-    BotCommand("help",      "List commands"),
-    BotCommand("status",    "System overview"),
-    BotCommand("health",    "Detailed node health"),
-    BotCommand("nodes",     "Worker-node roster"),
-    BotCommand("tasks",     "Task queue"),
-    BotCommand("logs",      "Last n log lines"),
-    BotCommand("earnings",  "Earnings summary"),
-    BotCommand("ask",       "One-shot question"),
-    BotCommand("chat",      "Conversation with history"),
-    BotCommand("restart",   "Restart a service (owner)"),
-    BotCommand("silence",   "Mute notifications"),
-    BotCommand("unsilence", "Re-enable notifications"),
+# (command, handler, menu description) — single source for both the
+# CommandHandler registrations and the BotCommand menu.
+HANDLERS = [
+    ("start",     cmd_start,     "Introduce Bob"),
+    ("help",      cmd_help,      "List commands"),
+    ("status",    cmd_status,    "System overview"),
+    ("health",    cmd_health,    "Detailed node health"),
+    ("nodes",     cmd_nodes,     "Worker-node roster"),
+    ("tasks",     cmd_tasks,     "Task queue"),
+    ("logs",      cmd_logs,      "Last n log lines"),
+    ("earnings",  cmd_earnings,  "Earnings summary"),
+    ("ask",       cmd_ask,       "One-shot question"),
+    ("chat",      cmd_chat,      "Conversation with history"),
+    ("restart",   cmd_restart,   "Restart a service (owner)"),
+    ("silence",   cmd_silence,   "Mute notifications"),
+    ("unsilence", cmd_unsilence, "Re-enable notifications"),
 ]
 
+COMMANDS = [BotCommand(name, description) for name, _, description in HANDLERS]
+
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
 def main() -> None:
+    try:
+        import uvloop  # optional — libuv event loop for the polling/HTTP workload
+        # Policy rather than uvloop.run(): run_polling creates its own loop.
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     app = (
         Application.builder()
         .token(BOT_TOKEN)
         .build()
     )
 
-    app.add_handler(CommandHandler("start",     cmd_start))
-    app.add_handler(CommandHandler("help",      cmd_help))
-    app.add_handler(CommandHandler("status",    cmd_status))
-    app.add_handler(CommandHandler("health",    cmd_health))
-    app.add_handler(CommandHandler("nodes",     cmd_nodes))
-    app.add_handler(CommandHandler("tasks",     cmd_tasks))
-    app.add_handler(CommandHandler("logs",      cmd_logs))
-    app.add_handler(CommandHandler("earnings",  cmd_earnings))
-    app.add_handler(CommandHandler("ask",       cmd_ask))
-    app.add_handler(CommandHandler("chat",      cmd_chat))
-    app.add_handler(CommandHandler("restart",   cmd_restart))
-    app.add_handler(CommandHandler("silence",   cmd_silence))
-    app.add_handler(CommandHandler("unsilence", cmd_unsilence))
+    app.add_handlers([CommandHandler(name, fn) for name, fn, _ in HANDLERS])
 
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text))
 
     async def on_startup(app: Application) -> None:
+        global _notify_task
+        _notify_task = asyncio.create_task(_notify_worker(app))
         await app.bot.set_my_commands(COMMANDS)
         log.info("Bob the Conductor is online. Owner chat ID: %s", OWNER_ID)
 
+    async def on_shutdown(app: Application) -> None:
+        if _notify_task is not None:
+            _notify_task.cancel()
+        await _close_session()
+
     app.post_init = on_startup
+    app.post_shutdown = on_shutdown
 
     log.info("Starting polling loop...")
     app.run_polling(drop_pending_updates=True)
@@ -7,22 +7,29 @@ Loads agent YAML configs from agents/ and routes requests by model name.
 """
 
 import asyncio
+import copy
+import hashlib
 import os
 import logging
 import json
+import re
+import threading
 import time
 import uuid
+from collections import OrderedDict, defaultdict
+from itertools import groupby
+from operator import itemgetter
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 import yaml
-import httpx
 import redis.asyncio as aioredis
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
 from memory import MemoryPlugin
 from agent_bus import AgentBus
@@ -36,6 +43,12 @@ from dtools_sync import DToolsSync
 from linear_sync import LinearSync
 from client_tracker import ClientTracker
 
+try:
+    import orjson  # optional: faster JSON encode/decode and responses
+    from fastapi.responses import ORJSONResponse as JSONResponse
+except ImportError:
+    orjson = None
+
 # ---------------------------------------------------------------------------
 # Environment & logging
 # ---------------------------------------------------------------------------
@@ -62,6 +75,31 @@ CONDUCTOR_MODEL = os.getenv("CONDUCTOR_MODEL", "claude-sonnet-4-5")
 # Redis (optional — graceful fallback if unavailable)
 REDIS_URL = os.getenv("REDIS_URL", "")
 
+# Provider connection pool (shared keep-alive sockets across agents)
+POOL_MAX = int(os.getenv("POOL_MAX", "512"))
+POOL_KEEPALIVE = float(os.getenv("POOL_KEEPALIVE", "75"))
+# Max in-flight provider calls (delegation fan-out shares this cap)
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+# Delegations to this many same-provider agents go through the provider Batch API
+BATCH_MIN_TARGETS = int(os.getenv("BATCH_MIN_TARGETS", "4"))
+BATCH_POLL_SECONDS = float(os.getenv("BATCH_POLL_SECONDS", "5"))
+BATCH_TIMEOUT = float(os.getenv("BATCH_TIMEOUT", "300"))
+
+
+def _json_dumpb(obj: Any) -> bytes:
+    """Encode a request body to JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Decode a provider response body (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 # ---------------------------------------------------------------------------
 # Daily token budget tracking
 # ---------------------------------------------------------------------------
@@ -130,6 +168,8 @@ class AgentConfig:
         self.stream: bool = model_block.get("stream", False)
 
         self.system_prompt: str = data.get("system_prompt", "")
+        self._system_prompt_stripped: str = self.system_prompt.strip()
+        self._cached_system: Optional[str] = None  # Anthropic system text without request system parts
         self.tools: list = data.get("tools", [])
         self.restrictions: dict = data.get("restrictions", {})
         self.source_file: str = source_file
@@ -141,39 +181,140 @@ class AgentConfig:
 # ---------------------------------------------------------------------------
 # Agent registry
 # ---------------------------------------------------------------------------
+# libyaml-backed loader when PyYAML was built with it; pure-Python otherwise.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_CACHE_MAX = 100
+# path -> (mtime_ns, size, inode, parsed)
+_YAML_CACHE: "OrderedDict[str, tuple[int, int, int, Any]]" = OrderedDict()
+_YAML_CACHE_LOCK = threading.Lock()
+
+
+def _read_yaml_cached(path: Path) -> Any:
+    """Parse a YAML file, reusing the previous result while the file is unchanged."""
+    st = os.stat(path)
+    key = str(path)
+    sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _YAML_CACHE_LOCK:
+        hit = _YAML_CACHE.get(key)
+        if hit and hit[:3] == sig:
+            _YAML_CACHE.move_to_end(key)
+            return copy.deepcopy(hit[3])
+    with open(path) as f:
+        data = yaml.load(f, Loader=_YAML_LOADER)
+    with _YAML_CACHE_LOCK:
+        _YAML_CACHE[key] = (*sig, data)
+        _YAML_CACHE.move_to_end(key)
+        while len(_YAML_CACHE) > _YAML_CACHE_MAX:
+            _YAML_CACHE.popitem(last=False)
+    return copy.deepcopy(data)
+
+
+def _parse_agent_file(yml_path: Path) -> Optional[AgentConfig]:
+    """Read one agent YAML; None for the registry file, empty or broken files."""
+    try:
+        data = _read_yaml_cached(yml_path)
+        if not data or not isinstance(data, dict):
+            return None
+        # Skip the registry file itself
+        if "registry_version" in data:
+            logger.info("Skipping registry file: %s", yml_path.name)
+            return None
+        return AgentConfig(data, str(yml_path))
+    except Exception as e:
+        logger.error("Failed to load agent config %s: %s", yml_path, e)
+        return None
+
+
 class AgentRegistry:
     """Loads all agent YAML configs and provides lookup by agent_id or model alias."""
 
-    def __init__(self, agents_dir: Path):
+    def __init__(self, agents_dir: Optional[Path] = None):
         self.agents: dict[str, AgentConfig] = {}
         self.default_agent_id: str = "bob_conductor"
-        self._load_agents(agents_dir)
-
-    def _load_agents(self, agents_dir: Path):
+        self._alias: dict[str, AgentConfig] = {}
+        self._deleg_alias: dict[str, str] = {}
+        self._models_payload: dict = {"object": "list", "data": []}
+        self._agents_detail: dict = {"agents": []}
+        self._health_payload_core: dict = {}
+        if agents_dir is not None:
+            self._load_agents(agents_dir)
+
+    @classmethod
+    async def load(cls, agents_dir: Path) -> "AgentRegistry":
+        """Build a registry, parsing the agent files concurrently in worker threads."""
+        registry = cls()
+        paths = registry._agent_files(agents_dir)
+        parsed = await asyncio.gather(*(asyncio.to_thread(_parse_agent_file, p) for p in paths))
+        registry._register(parsed)
+        return registry
+
+    @staticmethod
+    def _agent_files(agents_dir: Path) -> list[Path]:
         if not agents_dir.exists():
             logger.warning("Agents directory not found: %s", agents_dir)
-            return
+            return []
+        return sorted(agents_dir.glob("*.yml"))
 
-        for yml_path in sorted(agents_dir.glob("*.yml")):
-            try:
-                with open(yml_path) as f:
-                    data = yaml.safe_load(f)
-                if not data or not isinstance(data, dict):
-                    continue
-                # Skip the registry file itself
-                if "registry_version" in data:
-                    logger.info("Skipping registry file: %s", yml_path.name)
-                    continue
-                agent = AgentConfig(data, str(yml_path))
-                if agent.enabled:
-                    self.agents[agent.agent_id] = agent
-                    logger.info("Loaded agent: %s (%s/%s)", agent.agent_id, agent.provider, agent.model_id)
-                else:
-                    logger.info("Skipped disabled agent: %s", agent.agent_id)
-            except Exception as e:
-                logger.error("Failed to load agent config %s: %s", yml_path, e)
+    def _load_agents(self, agents_dir: Path):
+        self._register([_parse_agent_file(p) for p in self._agent_files(agents_dir)])
+
+    def _register(self, parsed: list[Optional[AgentConfig]]):
+        for agent in parsed:
+            if agent is None:
+                continue
+            if agent.enabled:
+                self.agents[agent.agent_id] = agent
+                logger.info("Loaded agent: %s (%s/%s)", agent.agent_id, agent.provider, agent.model_id)
+            else:
+                logger.info("Skipped disabled agent: %s", agent.agent_id)
 
         logger.info("Registry ready: %d agents loaded", len(self.agents))
+        self._build_aliases()
+        self._build_payloads()
+
+    def _build_payloads(self):
+        """Prebuild the listing bodies served by /health, /api/models and /api/agents."""
+        self._models_payload = {"object": "list", "data": self.list_agents()}
+        self._agents_detail = {
+            "agents": [
+                {
+                    "agent_id": a.agent_id,
+                    "display_name": a.display_name,
+                    "provider": a.provider,
+                    "model_id": a.model_id,
+                    "enabled": a.enabled,
+                    "version": a.version,
+                    "has_system_prompt": bool(a.system_prompt),
+                    "tool_count": len(a.tools),
+                }
+                for a in self.agents.values()
+            ]
+        }
+        self._health_payload_core = {
+            "status": "ok",
+            "service": "openclaw",
+            "version": "1.0.0",
+            "agents_loaded": len(self.agents),
+            "agents": list(self.agents),
+            "uptime": "running",
+        }
+
+    def _build_aliases(self):
+        """Index agent_id and its shorthands; exact ids win, then first agent loaded."""
+        alias = self._alias
+        alias.clear()
+        for aid, agent in self.agents.items():
+            alias[aid] = agent
+        for aid, agent in self.agents.items():
+            for key in (aid.lower(), aid.replace("_agent", ""), aid.split("_")[0]):
+                alias.setdefault(key, agent)
+                alias.setdefault(key.lower(), agent)
+        # "@name" delegation targets: lowercased agent_id or agent_id without _agent
+        deleg = self._deleg_alias
+        deleg.clear()
+        for aid in self.agents:
+            deleg.setdefault(aid.lower(), aid)
+            deleg.setdefault(aid.replace("_agent", "").lower(), aid)
 
     def get(self, agent_id: str) -> Optional[AgentConfig]:
         """Look up by agent_id directly."""
@@ -188,11 +329,12 @@ class AgentRegistry:
           - Shorthand: "bob", "proposals", "dtools"
           - Fallback: returns default agent
         """
-        # Direct match
-        if model_name in self.agents:
-            return self.agents[model_name]
+        # Direct or shorthand match
+        agent = self._alias.get(model_name) or self._alias.get(model_name.lower())
+        if agent:
+            return agent
 
-        # Shorthand match (prefix search)
+        # Fallback: prefix/substring search for names not in the index
         for aid, agent in self.agents.items():
             if aid.startswith(model_name) or model_name in aid:
                 return agent
@@ -230,29 +372,116 @@ class AgentRegistry:
 # ---------------------------------------------------------------------------
 # LLM provider calls
 # ---------------------------------------------------------------------------
+class _ProviderStream:
+    """
+    Async iterator over a streamed provider response that owns its resources.
+
+    The HTTP response and the concurrency permit are released exactly once:
+    when iteration finishes, on aclose(), or when the object is collected.
+    Starlette may drop a response body without ever iterating it (e.g. the
+    client disconnects first), so release cannot live only in the generator.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], resp, sem: asyncio.Semaphore):
+        self._chunks = chunks
+        self._resp = resp
+        self._sem = sem
+        self._released = False
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._resp.release()
+        self._sem.release()
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._relay()
+
+    async def _relay(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._chunks:
+                yield chunk
+        finally:
+            self.release()
+
+    async def aclose(self) -> None:
+        try:
+            await self._chunks.aclose()
+        finally:
+            self.release()
+
+    def __del__(self) -> None:
+        self.release()
+
+
 class LLMRouter:
     """Routes completion requests to the right LLM provider."""
 
     def __init__(self):
-        self._http = httpx.AsyncClient(timeout=120.0)
+        import aiohttp  # only the API server needs it, not scripts importing this module
+
+        # One pooled session for every provider call; httpx serialises badly under
+        # concurrent agent traffic.
+        self._session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=120),
+            connector=aiohttp.TCPConnector(
+                limit=POOL_MAX,
+                limit_per_host=max(1, POOL_MAX // 4),
+                keepalive_timeout=POOL_KEEPALIVE,
+            ),
+        )
+        self._sem = asyncio.Semaphore(LLM_CONCURRENCY)
+        self._prewarm_timeout = aiohttp.ClientTimeout(total=10)
+        # Static per-provider headers, built once and shared by every call
+        self._anth_headers = {
+            "x-api-key": ANTHROPIC_API_KEY,
+            "anthropic-version": "2023-06-01",
+            "content-type": "application/json",
+        }
+        self._oai_headers = {
+            "Authorization": f"Bearer {OPENAI_API_KEY}",
+            "Content-Type": "application/json",
+        }
+        self._ollama_headers = {"Content-Type": "application/json"}
+        self._oai_auth_headers = {"Authorization": f"Bearer {OPENAI_API_KEY}"}
+
+    async def prewarm(self):
+        """Open a keep-alive connection to each configured provider so the first
+        real completion skips the TCP/TLS handshake."""
+        bases = []
+        if ANTHROPIC_API_KEY:
+            bases.append("https://api.anthropic.com")
+        if OPENAI_API_KEY:
+            bases.append("https://api.openai.com")
+        if OLLAMA_HOST:
+            bases.append(OLLAMA_HOST.rstrip("/"))
+
+        async def _head(url: str):
+            try:
+                async with self._session.head(url, timeout=self._prewarm_timeout):
+                    pass
+            except Exception as e:
+                logger.debug("Pool prewarm failed for %s: %s", url, e)
+
+        await asyncio.gather(*(_head(u) for u in bases))
 
     async def complete(self, agent: AgentConfig, messages: list[dict], **kwargs) -> str:
         """Send messages to the agent's configured LLM provider, return response text."""
         provider = agent.provider.lower()
         if provider == "anthropic":
-            return await self._call_anthropic(agent, messages, **kwargs)
+            call = self._call_anthropic
         elif provider == "openai":
-            return await self._call_openai(agent, messages, **kwargs)
+            call = self._call_openai
         elif provider == "ollama":
-            return await self._call_ollama(agent, messages, **kwargs)
+            call = self._call_ollama
         else:
             raise ValueError(f"Unsupported provider: {provider}")
+        async with self._sem:
+            return await call(agent, messages, **kwargs)
 
-    async def _call_anthropic(self, agent: AgentConfig, messages: list[dict], **kwargs) -> str:
-        """Call Anthropic Messages API."""
-        if not ANTHROPIC_API_KEY:
-            raise ValueError("ANTHROPIC_API_KEY not set")
-
+    def _anthropic_payload(self, agent: AgentConfig, messages: list[dict], **kwargs) -> dict:
+        """Build an Anthropic Messages API payload from OpenAI-style messages."""
         # Separate system message from conversation
         system_parts = []
         conv_messages = []
@@ -262,24 +491,27 @@ class LLMRouter:
             else:
                 conv_messages.append({"role": m["role"], "content": m["content"]})
 
-        # Prepend agent system prompt if not already in messages
-        if agent.system_prompt and agent.system_prompt not in " ".join(system_parts):
-            system_parts.insert(0, agent.system_prompt)
-
-        system_text = "\n\n".join(system_parts)
+        if not system_parts:
+            # Common case: only the agent's own prompt, invariant per agent
+            if agent._cached_system is None:
+                agent._cached_system = agent.system_prompt if agent._system_prompt_stripped else ""
+            system_text = agent._cached_system
+        else:
+            # Prepend agent system prompt if not already in messages
+            prompt = agent._system_prompt_stripped
+            if prompt and not any(prompt in p for p in system_parts):
+                system_parts.insert(0, agent.system_prompt)
+            system_text = "\n\n".join(system_parts)
 
         # Ensure conversation starts with user message (Anthropic requirement)
         if not conv_messages or conv_messages[0]["role"] != "user":
             conv_messages.insert(0, {"role": "user", "content": "Hello"})
 
         # Merge consecutive same-role messages (Anthropic requires alternating)
-        merged = []
-        for msg in conv_messages:
-            if merged and merged[-1]["role"] == msg["role"]:
-                merged[-1]["content"] += "\n\n" + msg["content"]
-            else:
-                merged.append(dict(msg))
-        conv_messages = merged
+        conv_messages = [
+            {"role": role, "content": "\n\n".join(m["content"] for m in group)}
+            for role, group in groupby(conv_messages, key=itemgetter("role"))
+        ]
 
         # Use structured system block with cache_control for prompt caching.
         # This saves ~90% on input tokens for repeated calls with the same agent system prompt.
@@ -296,22 +528,24 @@ class LLMRouter:
             ],
             "messages": conv_messages,
         }
+        return payload
 
-        resp = await self._http.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": ANTHROPIC_API_KEY,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json",
-            },
-            json=payload,
-        )
+    async def _call_anthropic(self, agent: AgentConfig, messages: list[dict], **kwargs) -> str:
+        """Call Anthropic Messages API."""
+        if not ANTHROPIC_API_KEY:
+            raise ValueError("ANTHROPIC_API_KEY not set")
 
-        if resp.status_code != 200:
-            logger.error("Anthropic error %d: %s", resp.status_code, resp.text[:500])
-            raise HTTPException(status_code=502, detail=f"Anthropic API error: {resp.status_code}")
+        payload = self._anthropic_payload(agent, messages, **kwargs)
+        async with self._session.post(
+            "https://api.anthropic.com/v1/messages",
+            headers=self._anth_headers,
+            data=_json_dumpb(payload),
+        ) as resp:
+            if resp.status != 200:
+                logger.error("Anthropic error %d: %s", resp.status, (await resp.text())[:500])
+                raise HTTPException(status_code=502, detail=f"Anthropic API error: {resp.status}")
+            data = _json_loads(await resp.read())
 
-        data = resp.json()
         # Track token usage for daily budget
         usage = data.get("usage", {})
         if usage:
@@ -321,39 +555,38 @@ class LLMRouter:
         text_parts = [b.get("text", "") for b in content_blocks if b.get("type") == "text"]
         return "\n".join(text_parts).strip()
 
-    async def _call_openai(self, agent: AgentConfig, messages: list[dict], **kwargs) -> str:
-        """Call OpenAI Chat Completions API."""
-        if not OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY not set")
+    @staticmethod
+    def _with_system_prompt(agent: AgentConfig, messages: list[dict]) -> list[dict]:
+        """Inject the agent system prompt (in place) unless the request already has one."""
+        if agent.system_prompt and not any(m.get("role") == "system" for m in messages):
+            messages.insert(0, {"role": "system", "content": agent.system_prompt})
+        return messages
 
-        # Inject agent system prompt
-        final_messages = list(messages)
-        if agent.system_prompt:
-            has_system = any(m.get("role") == "system" for m in final_messages)
-            if not has_system:
-                final_messages.insert(0, {"role": "system", "content": agent.system_prompt})
-
-        payload = {
+    def _openai_payload(self, agent: AgentConfig, messages: list[dict], **kwargs) -> dict:
+        """Build an OpenAI Chat Completions payload."""
+        return {
             "model": agent.model_id,
             "max_tokens": kwargs.get("max_tokens", agent.max_output_tokens),
             "temperature": kwargs.get("temperature", agent.temperature),
-            "messages": final_messages,
+            "messages": self._with_system_prompt(agent, messages),
         }
 
-        resp = await self._http.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {OPENAI_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-        )
+    async def _call_openai(self, agent: AgentConfig, messages: list[dict], **kwargs) -> str:
+        """Call OpenAI Chat Completions API."""
+        if not OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY not set")
 
-        if resp.status_code != 200:
-            logger.error("OpenAI error %d: %s", resp.status_code, resp.text[:500])
-            raise HTTPException(status_code=502, detail=f"OpenAI API error: {resp.status_code}")
+        payload = self._openai_payload(agent, messages, **kwargs)
+        async with self._session.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers=self._oai_headers,
+            data=_json_dumpb(payload),
+        ) as resp:
+            if resp.status != 200:
+                logger.error("OpenAI error %d: %s", resp.status, (await resp.text())[:500])
+                raise HTTPException(status_code=502, detail=f"OpenAI API error: {resp.status}")
+            data = _json_loads(await resp.read())
 
-        data = resp.json()
         return data["choices"][0]["message"]["content"].strip()
 
     async def _call_ollama(self, agent: AgentConfig, messages: list[dict], **kwargs) -> str:
@@ -363,12 +596,7 @@ class LLMRouter:
 
         base = OLLAMA_HOST.rstrip("/")
 
-        # Inject agent system prompt
-        final_messages = list(messages)
-        if agent.system_prompt:
-            has_system = any(m.get("role") == "system" for m in final_messages)
-            if not has_system:
-                final_messages.insert(0, {"role": "system", "content": agent.system_prompt})
+        final_messages = self._with_system_prompt(agent, messages)
 
         payload = {
             "model": agent.model_id,
@@ -376,21 +604,300 @@ class LLMRouter:
             "stream": False,
         }
 
-        resp = await self._http.post(
+        async with self._session.post(
             f"{base}/v1/chat/completions",
-            headers={"Content-Type": "application/json"},
-            json=payload,
-        )
-
-        if resp.status_code != 200:
-            logger.error("Ollama error %d: %s", resp.status_code, resp.text[:500])
-            raise HTTPException(status_code=502, detail=f"Ollama API error: {resp.status_code}")
+            headers=self._ollama_headers,
+            data=_json_dumpb(payload),
+        ) as resp:
+            if resp.status != 200:
+                logger.error("Ollama error %d: %s", resp.status, (await resp.text())[:500])
+                raise HTTPException(status_code=502, detail=f"Ollama API error: {resp.status}")
+            data = _json_loads(await resp.read())
 
-        data = resp.json()
         return data["choices"][0]["message"]["content"].strip()
 
+    async def stream(self, agent: AgentConfig, messages: list[dict], **kwargs) -> _ProviderStream:
+        """
+        Start a streamed completion and return an iterator of OpenAI-style SSE bytes.
+
+        OpenAI and Ollama chunks are forwarded as received; Anthropic events are
+        re-shaped into chat.completion.chunk lines. Provider errors raise here,
+        before any bytes are sent, so the caller can still return a 502. The
+        caller must aclose() the result if it may never be iterated.
+        """
+        provider = agent.provider.lower()
+        if provider == "anthropic":
+            if not ANTHROPIC_API_KEY:
+                raise ValueError("ANTHROPIC_API_KEY not set")
+            url, headers, name = "https://api.anthropic.com/v1/messages", self._anth_headers, "Anthropic"
+            payload = self._anthropic_payload(agent, messages, **kwargs)
+        elif provider == "openai":
+            if not OPENAI_API_KEY:
+                raise ValueError("OPENAI_API_KEY not set")
+            url, headers, name = "https://api.openai.com/v1/chat/completions", self._oai_headers, "OpenAI"
+            payload = self._openai_payload(agent, messages, **kwargs)
+        elif provider == "ollama":
+            if not OLLAMA_HOST:
+                raise ValueError("OLLAMA_HOST not set")
+            url, headers, name = f"{OLLAMA_HOST.rstrip('/')}/v1/chat/completions", self._ollama_headers, "Ollama"
+            payload = {"model": agent.model_id, "messages": self._with_system_prompt(agent, messages)}
+        else:
+            raise ValueError(f"Unsupported provider: {provider}")
+        payload["stream"] = True
+
+        await self._sem.acquire()
+        try:
+            resp = await self._session.post(url, headers=headers, data=_json_dumpb(payload))
+        except BaseException:
+            self._sem.release()
+            raise
+        if resp.status != 200:
+            try:
+                logger.error("%s stream error %d: %s", name, resp.status, (await resp.text())[:500])
+            finally:
+                resp.release()
+                self._sem.release()
+            raise HTTPException(status_code=502, detail=f"{name} API error: {resp.status}")
+
+        async def relay() -> AsyncIterator[bytes]:
+            if provider != "anthropic":
+                async for chunk in resp.content.iter_any():
+                    yield chunk
+                return
+            async for chunk in self._anthropic_sse_to_openai(agent, resp):
+                yield chunk
+
+        return _ProviderStream(relay(), resp, self._sem)
+
+    async def _anthropic_sse_to_openai(self, agent: AgentConfig, resp) -> AsyncIterator[bytes]:
+        """Translate Anthropic message stream events into OpenAI chunk SSE lines."""
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": agent.agent_id,
+        }
+        usage: dict = {}
+        async for line in resp.content:
+            if not line.startswith(b"data:"):
+                continue
+            event = _json_loads(line[5:])
+            etype = event.get("type")
+            if etype == "content_block_delta":
+                text = event.get("delta", {}).get("text")
+                if text:
+                    chunk = {**base, "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+                    yield b"data: " + _json_dumpb(chunk) + b"\n\n"
+            elif etype == "message_start":
+                usage.update(event.get("message", {}).get("usage", {}))
+            elif etype == "message_delta":
+                usage.update(event.get("usage", {}))
+        if usage:
+            token_tracker.record(usage)
+        chunk = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        yield b"data: " + _json_dumpb(chunk) + b"\n\n"
+        yield b"data: [DONE]\n\n"
+
+    # -- Batch APIs ---------------------------------------------------------
+
+    async def complete_batch(self, jobs: list[tuple[AgentConfig, list[dict]]]) -> list:
+        """
+        Run several completions for one provider through its Batch API (about half
+        the per-token price). Returns reply text or an exception per job, in order.
+        Raises if the batch itself fails or does not finish within BATCH_TIMEOUT.
+        """
+        provider = jobs[0][0].provider.lower()
+        if provider == "anthropic":
+            return await self._anthropic_batch(jobs)
+        if provider == "openai":
+            return await self._openai_batch(jobs)
+        raise ValueError(f"No batch API for provider: {provider}")
+
+    async def _request_json(self, method: str, url: str, headers: dict, name: str, body: Any = None) -> dict:
+        data = _json_dumpb(body) if body is not None else None
+        async with self._session.request(method, url, headers=headers, data=data) as resp:
+            if resp.status != 200:
+                logger.error("%s batch error %d: %s", name, resp.status, (await resp.text())[:500])
+                raise HTTPException(status_code=502, detail=f"{name} API error: {resp.status}")
+            return _json_loads(await resp.read())
+
+    async def _request_bytes(self, url: str, headers: dict, name: str) -> bytes:
+        async with self._session.get(url, headers=headers) as resp:
+            if resp.status != 200:
+                raise HTTPException(status_code=502, detail=f"{name} API error: {resp.status}")
+            return await resp.read()
+
+    async def _poll_batch(self, url: str, headers: dict, name: str, is_done) -> dict:
+        """Poll a batch until is_done(batch); cancel it and raise on timeout."""
+        deadline = time.monotonic() + BATCH_TIMEOUT
+        while True:
+            batch = await self._request_json("GET", url, headers, name)
+            if is_done(batch):
+                return batch
+            if time.monotonic() >= deadline:
+                try:
+                    await self._request_json("POST", f"{url}/cancel", headers, name)
+                except Exception as e:
+                    logger.warning("%s batch cancel failed: %s", name, e)
+                raise TimeoutError(f"{name} batch {batch.get('id')} not done after {BATCH_TIMEOUT:.0f}s")
+            await asyncio.sleep(BATCH_POLL_SECONDS)
+
+    async def _anthropic_batch(self, jobs: list[tuple[AgentConfig, list[dict]]]) -> list:
+        if not ANTHROPIC_API_KEY:
+            raise ValueError("ANTHROPIC_API_KEY not set")
+        base = "https://api.anthropic.com/v1/messages/batches"
+        requests = [
+            {"custom_id": f"req-{i}", "params": self._anthropic_payload(agent, messages)}
+            for i, (agent, messages) in enumerate(jobs)
+        ]
+        batch = await self._request_json("POST", base, self._anth_headers, "Anthropic", {"requests": requests})
+        batch = await self._poll_batch(
+            f"{base}/{batch['id']}", self._anth_headers, "Anthropic",
+            lambda b: b.get("processing_status") == "ended",
+        )
+        raw = await self._request_bytes(batch["results_url"], self._anth_headers, "Anthropic")
+
+        results: dict[str, Any] = {}
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            item = _json_loads(line)
+            result = item.get("result", {})
+            if result.get("type") != "succeeded":
+                results[item["custom_id"]] = RuntimeError(f"Anthropic batch request {result.get('type')}")
+                continue
+            message = result.get("message", {})
+            if message.get("usage"):
+                token_tracker.record(message["usage"])
+            text_parts = [b.get("text", "") for b in message.get("content", []) if b.get("type") == "text"]
+            results[item["custom_id"]] = "\n".join(text_parts).strip()
+        return [results.get(f"req-{i}", RuntimeError("missing from batch results")) for i in range(len(jobs))]
+
+    async def _openai_batch(self, jobs: list[tuple[AgentConfig, list[dict]]]) -> list:
+        import aiohttp
+
+        if not OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY not set")
+        lines = b"\n".join(
+            _json_dumpb({
+                "custom_id": f"req-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._openai_payload(agent, messages),
+            })
+            for i, (agent, messages) in enumerate(jobs)
+        )
+        form = aiohttp.FormData()
+        form.add_field("purpose", "batch")
+        form.add_field("file", lines, filename="delegations.jsonl", content_type="application/jsonl")
+        async with self._session.post(
+            "https://api.openai.com/v1/files", headers=self._oai_auth_headers, data=form,
+        ) as resp:
+            if resp.status != 200:
+                logger.error("OpenAI file upload error %d: %s", resp.status, (await resp.text())[:500])
+                raise HTTPException(status_code=502, detail=f"OpenAI API error: {resp.status}")
+            upload = _json_loads(await resp.read())
+
+        batch = await self._request_json(
+            "POST", "https://api.openai.com/v1/batches", self._oai_headers, "OpenAI",
+            {"input_file_id": upload["id"], "endpoint": "/v1/chat/completions", "completion_window": "24h"},
+        )
+        batch = await self._poll_batch(
+            f"https://api.openai.com/v1/batches/{batch['id']}", self._oai_headers, "OpenAI",
+            lambda b: b.get("status") in ("completed", "failed", "expired", "cancelled"),
+        )
+        if batch.get("status") != "completed":
+            raise RuntimeError(f"OpenAI batch {batch.get('id')} {batch.get('status')}")
+
+        results: dict[str, Any] = {}
+        if batch.get("output_file_id"):
+            raw = await self._request_bytes(
+                f"https://api.openai.com/v1/files/{batch['output_file_id']}/content",
+                self._oai_auth_headers, "OpenAI",
+            )
+            for line in raw.splitlines():
+                if not line.strip():
+                    continue
+                item = _json_loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") != 200:
+                    results[item["custom_id"]] = RuntimeError(f"OpenAI batch request failed: {item.get('error')}")
+                    continue
+                results[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"].strip()
+        return [results.get(f"req-{i}", RuntimeError("missing from batch results")) for i in range(len(jobs))]
+
     async def close(self):
-        await self._http.aclose()
+        await self._session.close()
+
+
+# ---------------------------------------------------------------------------
+# Deterministic response cache
+# ---------------------------------------------------------------------------
+RESPONSE_CACHE_MAX = 1024
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.1
+_RESPONSE_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+
+
+async def complete_cached(agent: AgentConfig, messages: list[dict], **kwargs) -> str:
+    """llm.complete, reusing earlier replies for identical near-deterministic requests."""
+    temperature = kwargs.get("temperature", agent.temperature)
+    if temperature is None or temperature > RESPONSE_CACHE_MAX_TEMPERATURE:
+        return await llm.complete(agent, messages, **kwargs)
+
+    key = hashlib.blake2b(
+        _json_dumpb([agent.agent_id, messages, temperature, kwargs.get("max_tokens")]),
+        digest_size=16,
+    ).digest()
+    hit = _RESPONSE_CACHE.get(key)
+    if hit is not None:
+        _RESPONSE_CACHE.move_to_end(key)
+        logger.debug("Response cache hit for agent %s", agent.agent_id)
+        return hit
+
+    text = await llm.complete(agent, messages, **kwargs)
+    _RESPONSE_CACHE[key] = text
+    if len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAX:
+        _RESPONSE_CACHE.popitem(last=False)
+    return text
+
+
+async def run_delegations(targets: list[tuple[AgentConfig, str]]) -> list:
+    """
+    Run delegated sub-calls concurrently. Groups of BATCH_MIN_TARGETS or more
+    Anthropic/OpenAI agents go through the Batch API, falling back to direct
+    calls if the batch fails. Returns reply text or an exception per target.
+    """
+    jobs = [(agent, [{"role": "user", "content": msg}]) for agent, msg in targets]
+    results: list = [None] * len(jobs)
+
+    by_provider: dict[str, list[int]] = defaultdict(list)
+    for i, (agent, _) in enumerate(jobs):
+        by_provider[agent.provider.lower()].append(i)
+    batches = [
+        idx for provider, idx in by_provider.items()
+        if provider in ("anthropic", "openai") and len(idx) >= BATCH_MIN_TARGETS
+    ]
+    batched = {i for idx in batches for i in idx}
+
+    async def direct(idx: list[int]):
+        out = await asyncio.gather(*(complete_cached(*jobs[i]) for i in idx), return_exceptions=True)
+        for i, r in zip(idx, out):
+            results[i] = r
+
+    async def batch(idx: list[int]):
+        try:
+            out = await llm.complete_batch([jobs[i] for i in idx])
+        except Exception as e:
+            logger.warning("Batch delegation failed, calling agents directly: %s", e)
+            return await direct(idx)
+        for i, r in zip(idx, out):
+            results[i] = r
+
+    await asyncio.gather(
+        direct([i for i in range(len(jobs)) if i not in batched]),
+        *(batch(idx) for idx in batches),
+    )
+    return results
 
 
 # ---------------------------------------------------------------------------
@@ -485,6 +992,8 @@ async def fetch_url_content(url: str) -> tuple[str, str]:
     For GitHub URLs, tries to fetch README. For Twitter/X, falls back to
     Perplexity search when direct fetch returns empty/login-wall content.
     """
+    import httpx
+
     headers = {"User-Agent": BROWSER_USER_AGENT}
 
     # GitHub repo → fetch README
@@ -567,6 +1076,7 @@ async def _analyze_with_ollama(url: str, content: str, context_hint: str) -> dic
     """Try Ollama (free) for link analysis. Returns {} on failure."""
     if not OLLAMA_HOST:
         return {}
+    import httpx
 
     user_prompt = f"Analyze this content from {url}:\n\n{content[:10000]}"
     if context_hint:
@@ -601,6 +1111,8 @@ async def _analyze_with_ollama(url: str, content: str, context_hint: str) -> dic
 
 async def _analyze_with_haiku(url: str, content: str, context_hint: str) -> dict:
     """Fallback to Claude Haiku (paid) for link analysis."""
+    import httpx
+
     user_prompt = f"Content from {url}:\n\n{content}"
     if context_hint:
         user_prompt += f"\n\nContext hint: focus on relevance to {context_hint}."
@@ -688,6 +1200,9 @@ async def publish_high_relevance(results: list[dict]):
 # ---------------------------------------------------------------------------
 # Delegation detection
 # ---------------------------------------------------------------------------
+_DELEG_RE = re.compile(r"^@(\S+)(?:\s+(.*))?", re.DOTALL)
+
+
 def detect_delegation(text: str, registry: AgentRegistry) -> Optional[tuple[str, str]]:
     """
     Check if agent output contains a @delegation command.
@@ -695,23 +1210,42 @@ def detect_delegation(text: str, registry: AgentRegistry) -> Optional[tuple[str,
     """
     if not text:
         return None
-    lines = text.strip().split("\n")
-    first_line = lines[0].strip()
-    if first_line.startswith("@"):
-        parts = first_line.split(None, 1)
-        prefix = parts[0][1:]  # Strip @
-        rest = parts[1] if len(parts) > 1 else ""
-        # Check remaining lines too
-        if not rest and len(lines) > 1:
-            rest = "\n".join(lines[1:]).strip()
-        # Try to resolve the prefix to an agent
-        for aid in registry.agents:
-            short = aid.replace("_agent", "")
-            if prefix.lower() in (aid.lower(), short.lower()):
-                return aid, rest
+    s = text.lstrip()
+    if s[:1] != "@":
+        return None
+    nl = s.find("\n")
+    m = _DELEG_RE.match((s[:nl] if nl >= 0 else s).strip())
+    if not m:
+        return None
+    rest = m.group(2) or ""
+    # Check remaining lines too
+    if not rest and nl >= 0:
+        rest = s[nl + 1:].strip()
+    target = registry._deleg_alias.get(m.group(1).lower())
+    if target:
+        return target, rest
     return None
 
 
+def detect_delegations(text: str, registry: AgentRegistry) -> list[tuple[str, str]]:
+    """
+    Like detect_delegation, but a reply with several "@agent message" lines
+    delegates to each of them. Returns a list of (target_agent_id, message).
+    """
+    if not text or text.lstrip()[:1] != "@":
+        return []
+    targets = []
+    for line in text.strip().split("\n"):
+        m = _DELEG_RE.match(line.strip())
+        target = registry._deleg_alias.get(m.group(1).lower()) if m else None
+        if target and m.group(2):
+            targets.append((target, m.group(2)))
+    if len(targets) > 1:
+        return targets
+    single = detect_delegation(text, registry)
+    return [single] if single else []
+
+
 # ---------------------------------------------------------------------------
 # FastAPI application
 # ---------------------------------------------------------------------------
@@ -719,6 +1253,7 @@ app = FastAPI(
     title="OpenClaw",
     description="Multi-agent orchestration — OpenAI-compatible API",
     version="1.0.0",
+    default_response_class=JSONResponse,
 )
 
 # Job lifecycle API routes
@@ -746,8 +1281,9 @@ outcome_listener_task: Optional[asyncio.Task] = None  # type: ignore
 async def startup():
     global registry, llm, orchestrator, memory, agent_bus, job_mgr, knowledge_base, dtools_sync, linear_sync, client_tracker, outcome_listener_task
     logger.info("OpenClaw starting up...")
-    registry = AgentRegistry(AGENTS_DIR)
+    registry = await AgentRegistry.load(AGENTS_DIR)
     llm = LLMRouter()
+    asyncio.create_task(llm.prewarm())
 
     # Ensure data directories exist
     DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -857,16 +1393,17 @@ async def shutdown():
 # ---------------------------------------------------------------------------
 @app.get("/health")
 async def health():
-    agent_count = len(registry.agents) if registry else 0
-    agent_list = list(registry.agents.keys()) if registry else []
-    body: dict = {
-        "status": "ok",
-        "service": "openclaw",
-        "version": "1.0.0",
-        "agents_loaded": agent_count,
-        "agents": agent_list,
-        "uptime": "running",
-    }
+    if registry:
+        body: dict = dict(registry._health_payload_core)
+    else:
+        body = {
+            "status": "ok",
+            "service": "openclaw",
+            "version": "1.0.0",
+            "agents_loaded": 0,
+            "agents": [],
+            "uptime": "running",
+        }
     # Briefing delivery state (written by orchestrator after daily notify)
     try:
         bpath = DATA_DIR / "briefing_status.json"
@@ -993,10 +1530,9 @@ async def internal_approval(body: InternalApprovalBody):
 @app.get("/v1/models")
 async def list_models():
     """OpenAI-compatible model listing."""
-    return {
-        "object": "list",
-        "data": registry.list_agents() if registry else [],
-    }
+    if not registry:
+        return {"object": "list", "data": []}
+    return JSONResponse(registry._models_payload)
 
 
 @app.post("/api/chat/completions")
@@ -1023,8 +1559,8 @@ async def chat_completions(req: ChatCompletionRequest):
         agent.agent_id, agent.provider, agent.model_id, len(req.messages),
     )
 
-    # Build messages list
-    messages = [{"role": m.role, "content": m.content} for m in req.messages]
+    # Build messages list (one pydantic-core dump; the list is then passed by reference)
+    messages = req.model_dump(include={"messages"})["messages"]
 
     # Inject memory context as a system block
     if memory:
@@ -1044,37 +1580,50 @@ async def chat_completions(req: ChatCompletionRequest):
     if req.temperature is not None:
         kwargs["temperature"] = req.temperature
 
+    # Streaming: relay provider chunks as they arrive (no delegation or caching)
+    if req.stream:
+        try:
+            chunks = await llm.stream(agent, messages, **kwargs)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error("LLM stream failed for agent %s: %s", agent.agent_id, e)
+            raise HTTPException(status_code=502, detail=f"LLM provider error: {e}")
+        return StreamingResponse(
+            chunks, media_type="text/event-stream", background=BackgroundTask(chunks.aclose)
+        )
+
     try:
-        response_text = await llm.complete(agent, messages, **kwargs)
+        response_text = await complete_cached(agent, messages, **kwargs)
     except HTTPException:
         raise
     except Exception as e:
         logger.error("LLM call failed for agent %s: %s", agent.agent_id, e)
         raise HTTPException(status_code=502, detail=f"LLM provider error: {e}")
 
-    # Check for delegation in the response
-    delegation = detect_delegation(response_text, registry)
-    if delegation:
-        target_id, delegated_msg = delegation
-        target_agent = registry.get(target_id)
-        if target_agent:
-            # Verify delegation is allowed
-            allowed = agent.restrictions.get("can_delegate", True)
-            if allowed:
-                logger.info(
-                    "Delegation: %s → %s (%d chars)",
-                    agent.agent_id, target_id, len(delegated_msg),
-                )
-                try:
-                    delegation_messages = [{"role": "user", "content": delegated_msg}]
-                    sub_response = await llm.complete(target_agent, delegation_messages)
-                    # Combine: note the delegation happened + sub-agent response
-                    response_text = (
-                        f"[Delegated to {target_agent.display_name}]\n\n{sub_response}"
-                    )
-                except Exception as e:
-                    logger.error("Delegation to %s failed: %s", target_id, e)
-                    response_text += f"\n\n[Delegation to {target_agent.display_name} failed: {e}]"
+    # Check for delegation in the response; several targets run concurrently
+    delegations = detect_delegations(response_text, registry)
+    if delegations and agent.restrictions.get("can_delegate", True):
+        targets = [(registry.get(tid), msg) for tid, msg in delegations]
+        targets = [(t, msg) for t, msg in targets if t]
+        for target_agent, delegated_msg in targets:
+            logger.info(
+                "Delegation: %s → %s (%d chars)",
+                agent.agent_id, target_agent.agent_id, len(delegated_msg),
+            )
+        results = await run_delegations(targets)
+        delegated, failed = [], []
+        for (target_agent, _), sub_response in zip(targets, results):
+            if isinstance(sub_response, BaseException):
+                logger.error("Delegation to %s failed: %s", target_agent.agent_id, sub_response)
+                failed.append(f"[Delegation to {target_agent.display_name} failed: {sub_response}]")
+            else:
+                # Combine: note the delegation happened + sub-agent response
+                delegated.append(f"[Delegated to {target_agent.display_name}]\n\n{sub_response}")
+        if delegated:
+            response_text = "\n\n".join(delegated)
+        if failed:
+            response_text += "\n\n" + "\n\n".join(failed)
 
     return JSONResponse(
         content=make_completion_response(agent.agent_id, response_text, agent.model_id)
@@ -1086,21 +1635,7 @@ async def list_agents_detail():
     """Detailed agent listing (non-OpenAI, internal use)."""
     if not registry:
         return {"agents": []}
-    return {
-        "agents": [
-            {
-                "agent_id": a.agent_id,
-                "display_name": a.display_name,
-                "provider": a.provider,
-                "model_id": a.model_id,
-                "enabled": a.enabled,
-                "version": a.version,
-                "has_system_prompt": bool(a.system_prompt),
-                "tool_count": len(a.tools),
-            }
-            for a in registry.agents.values()
-        ]
-    }
+    return JSONResponse(registry._agents_detail)
 
 
 @app.get("/api/token-usage")
@@ -2,8 +2,8 @@
 import os
 import subprocess
 import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from datetime import datetime
 
 BASE = Path(os.environ.get("AI_SERVER_DIR", str(Path.home() / "AI-Server")))
 LOG = BASE / "orchestrator/logs/bob_orchestrator.log"
@@ -30,7 +30,22 @@ PIPELINES = {
     ]
 }
 
+# Step -> steps whose output it reads. Steps whose deps are done run concurrently;
+# pipelines without an entry here run strictly in order.
+PIPELINE_DEPS = {
+    "refresh_everything": {
+        "scan_raw_projects": [],
+        "scan_library": [],
+        "build_inventory": ["scan_raw_projects", "scan_library"],
+        "fetch_manuals": ["build_inventory"],  # reads manual_fetch_queue.csv
+        "room_mapper": ["scan_raw_projects", "scan_library"],
+        "build_room_packages": ["room_mapper"],  # reads SKU_Room_Map.csv
+    }
+}
+
 def log(message: str):
+    from datetime import datetime
+
     ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     with LOG.open("a", encoding="utf-8") as f:
         f.write(f"[{ts}] {message}\n")
@@ -53,8 +68,28 @@ def run_pipeline(name: str):
     if name not in PIPELINES:
         print("Unknown pipeline.")
         return
-    for step in PIPELINES[name]:
-        execute(step)
+    steps = PIPELINES[name]
+    deps = PIPELINE_DEPS.get(name)
+    if deps is None:
+        for step in steps:
+            execute(step)
+        print("Pipeline complete.")
+        return
+
+    done = set()
+    remaining = list(steps)
+    running = {}
+    with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+        while remaining or running:
+            for step in [s for s in remaining if done.issuperset(deps.get(s, ()))]:
+                remaining.remove(step)
+                running[pool.submit(execute, step)] = step
+            if not running:
+                print(f"Unsatisfiable dependencies: {', '.join(remaining)}")
+                return
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                done.add(running.pop(fut))
     print("Pipeline complete.")
 
 def main():
@@ -11,15 +11,17 @@ Architecture:
 
 Usage:
     from dtool_cloud_client import DToolsCloudClient
-    client = DToolsCloudClient()
-    project_id = await client.create_project("Smith", "Smith Residence", "123 Main St")
+    async with DToolsCloudClient() as client:
+        project_id = await client.create_project("Smith", "Smith Residence", "123 Main St")
 """
 
 import asyncio
 import csv
 import io
+import json
 import logging
 import os
+import random
 import time
 from dataclasses import dataclass, field
 from enum import Enum
@@ -59,7 +61,25 @@ DEFAULT_FALLBACK_URL = "http://192.168.1.30:3000"
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_BACKOFF_BASE = 2.0   # seconds; exponential backoff
+RETRY_BACKOFF_CAP = 30.0   # seconds; upper bound before jitter
 REQUEST_TIMEOUT = 60.0     # seconds
+DOWNLOAD_TIMEOUT = 120.0   # seconds; proposal PDF download
+HEALTH_TIMEOUT = 5.0       # seconds
+
+# Per-node circuit breaker
+BREAKER_FAILURE_THRESHOLD = 3     # connect/timeout failures ...
+BREAKER_FAILURE_WINDOW = 60.0     # ... within this many seconds open the circuit
+BREAKER_RECOVERY_TIMEOUT = 30.0   # seconds before a half-open trial call
+
+# Read-result caching (seconds). Mutations are never cached.
+CACHE_TTL_SEARCH_PROJECTS = 60.0
+CACHE_TTL_SEARCH_CATALOG = 300.0
+CACHE_TTL_GET_PROJECT = 30.0
+SESSION_OK_TTL = 30.0
+CACHE_MAX_ENTRIES = 256
+
+# Read-only HARPA commands; identical concurrent calls share one round-trip
+IDEMPOTENT_PREFIXES = ("search_", "get_", "session_")
 
 
 # ---------------------------------------------------------------------------
@@ -152,6 +172,60 @@ class DTImportResult:
 # HARPA Bridge
 # ---------------------------------------------------------------------------
 
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class _Breaker:
+    """Circuit breaker for one HARPA node: skip it for a while after repeated connect failures."""
+    failure_threshold: int = BREAKER_FAILURE_THRESHOLD
+    failure_window_s: float = BREAKER_FAILURE_WINDOW
+    recovery_timeout_s: float = BREAKER_RECOVERY_TIMEOUT
+    state: BreakerState = BreakerState.CLOSED
+    failures: int = 0
+    first_failure_at: float = 0.0
+    opened_at: float = 0.0
+    trial_in_flight: bool = False
+
+    def allow(self) -> bool:
+        """
+        False while open. After the recovery timeout, go half-open and let exactly
+        one trial call through; other callers skip the node until it finishes.
+        """
+        if self.state is BreakerState.CLOSED:
+            return True
+        if self.state is BreakerState.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout_s:
+                return False
+            self.state = BreakerState.HALF_OPEN
+        if self.trial_in_flight:
+            return False
+        self.trial_in_flight = True
+        return True
+
+    def end_trial(self) -> None:
+        """Call after every allowed attempt; frees the half-open trial slot."""
+        self.trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        if self.state is BreakerState.HALF_OPEN:
+            self.state, self.opened_at = BreakerState.OPEN, now
+            return
+        if not self.failures or now - self.first_failure_at > self.failure_window_s:
+            self.failures, self.first_failure_at = 0, now
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.state, self.opened_at = BreakerState.OPEN, now
+
+
 class HARPABridge:
     """
     Routes commands to D-Tools Cloud via the HARPA AI browser automation bridge.
@@ -170,8 +244,32 @@ class HARPABridge:
         self.fallback_url = fallback_url or os.getenv("HARPA_FALLBACK_URL", DEFAULT_FALLBACK_URL)
         self.api_key = api_key or os.getenv("HARPA_GRID_API_KEY", "")
         self._node_status: dict[str, bool] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._breakers: dict[str, _Breaker] = {}
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, so keep-alive connections to both nodes are reused."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=30.0),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
-    async def execute(self, command: str, params: dict, retries: int = MAX_RETRIES) -> dict:
+    async def execute(
+        self,
+        command: str,
+        params: dict,
+        retries: int = MAX_RETRIES,
+        idempotent: Optional[bool] = None,
+    ) -> dict:
         """
         Execute a D-Tools HARPA command with retry and failover.
 
@@ -179,6 +277,8 @@ class HARPABridge:
             command: HARPA command name (e.g. "create_project")
             params: Command parameters
             retries: Max retry attempts
+            idempotent: Share one in-flight call among identical concurrent
+                requests. Defaults to True for search_*/get_*/session_* commands.
 
         Returns:
             Command result dict
@@ -187,19 +287,45 @@ class HARPABridge:
             HARPANodeUnavailable: If all nodes are unreachable after retries
             DTSessionExpired: If D-Tools browser session has expired
         """
+        if idempotent is None:
+            idempotent = command.startswith(IDEMPOTENT_PREFIXES)
+        if not idempotent:
+            return await self._execute(command, params, retries)
+
+        key = (command, json.dumps(params, sort_keys=True, default=str))
+        task = self._inflight.get(key)
+        if task is None:
+            # Own task, so one caller's cancellation/timeout never cancels the others
+            task = asyncio.ensure_future(self._execute(command, params, retries))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key) if self._inflight.get(key) is t else None)
+            # Mark the outcome retrieved even if every caller has gone away
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.shield(task)
+
+    async def _execute(self, command: str, params: dict, retries: int) -> dict:
+        """Retry/failover loop behind execute()."""
         nodes = [self.primary_url, self.fallback_url]
         last_exception: Optional[Exception] = None
 
         for attempt in range(retries):
             for node_url in nodes:
+                breaker = self._breakers.setdefault(node_url, _Breaker())
+                if not breaker.allow():
+                    logger.debug("HARPA node %s skipped (circuit open)", node_url)
+                    continue
                 try:
                     result = await self._call_node(node_url, command, params)
                     self._node_status[node_url] = True
+                    breaker.record_success()
                     return result
 
                 except (httpx.ConnectError, httpx.TimeoutException) as e:
                     logger.warning("HARPA node %s unreachable (attempt %d): %s", node_url, attempt + 1, e)
                     self._node_status[node_url] = False
+                    breaker.record_failure()
+                    if breaker.state is BreakerState.OPEN:
+                        logger.warning("HARPA node %s circuit open for %.0fs", node_url, breaker.recovery_timeout_s)
                     last_exception = e
                     continue
 
@@ -211,14 +337,18 @@ class HARPABridge:
                     last_exception = e
                     continue
 
-            # Exponential backoff before next retry round
+                finally:
+                    breaker.end_trial()
+
+            # Full-jitter exponential backoff so concurrent callers don't retry in lockstep
             if attempt < retries - 1:
-                wait = RETRY_BACKOFF_BASE ** attempt
+                wait = random.uniform(0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE ** attempt))
                 logger.info("Retrying in %.1fs...", wait)
                 await asyncio.sleep(wait)
 
         raise HARPANodeUnavailable(
-            f"All HARPA nodes unreachable after {retries} attempt(s). Last error: {last_exception}"
+            f"All HARPA nodes unreachable after {retries} attempt(s). "
+            f"Last error: {last_exception or 'circuit open on all nodes'}"
         )
 
     async def _call_node(self, node_url: str, command: str, params: dict) -> dict:
@@ -229,10 +359,10 @@ class HARPABridge:
             "api_key": self.api_key,
         }
 
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as http:
-            resp = await http.post(f"{node_url}/execute", json=payload)
-            resp.raise_for_status()
-            data = resp.json()
+        http = await self._get_client()
+        resp = await http.post(f"{node_url}/execute", json=payload)
+        resp.raise_for_status()
+        data = resp.json()
 
         # Check for session expiry
         error_msg = str(data.get("error", "")).lower()
@@ -245,23 +375,51 @@ class HARPABridge:
         return data
 
     async def health_check(self) -> dict[str, bool]:
-        """Check which HARPA nodes are reachable."""
-        results: dict[str, bool] = {}
-        for node_url in [self.primary_url, self.fallback_url]:
-            try:
-                async with httpx.AsyncClient(timeout=5.0) as http:
-                    resp = await http.get(f"{node_url}/health")
-                    results[node_url] = resp.status_code == 200
-            except Exception:
-                results[node_url] = False
+        """Check which HARPA nodes are reachable (probed concurrently)."""
+        nodes = [self.primary_url, self.fallback_url]
+        probes = await asyncio.gather(*(self._probe(url) for url in nodes), return_exceptions=True)
+        results = {url: ok is True for url, ok in zip(nodes, probes)}
         self._node_status = results
         return results
 
+    async def _probe(self, node_url: str) -> bool:
+        """GET {node}/health on the shared client; True on HTTP 200."""
+        http = await self._get_client()
+        resp = await http.get(f"{node_url}/health", timeout=HEALTH_TIMEOUT)
+        return resp.status_code == 200
+
 
 # ---------------------------------------------------------------------------
 # D-Tools Cloud Client
 # ---------------------------------------------------------------------------
 
+class _TTLCache:
+    """Small insertion-ordered cache of HARPA read results with age tracking."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self._data: dict[tuple, tuple[float, dict]] = {}
+        self._max_entries = max_entries
+
+    def get(self, key: tuple) -> Optional[tuple[dict, float]]:
+        """Return (value, age_seconds) or None."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        return value, time.monotonic() - stored_at
+
+    def set(self, key: tuple, value: dict) -> None:
+        self._data.pop(key, None)
+        self._data[key] = (time.monotonic(), value)
+        while len(self._data) > self._max_entries:
+            del self._data[next(iter(self._data))]
+
+    def discard(self, predicate) -> None:
+        """Drop every entry whose key matches predicate(key)."""
+        for key in [k for k in self._data if predicate(k)]:
+            del self._data[key]
+
+
 class DToolsCloudClient:
     """
     High-level client for D-Tools Cloud via HARPA browser automation.
@@ -280,8 +438,40 @@ class DToolsCloudClient:
     ):
         self.bridge = HARPABridge(harpa_primary_url, harpa_fallback_url, harpa_api_key)
         self._notify_hook = notify_hook  # async callable for owner alerts
+        self._cache = _TTLCache()
+        self._session_ok_until: float = 0.0
+        self._session_lock = asyncio.Lock()
+        self._session_status_supported: Optional[bool] = None  # learned on first probe
         logger.info("DToolsCloudClient initialized (primary: %s)", self.bridge.primary_url)
 
+    async def aclose(self) -> None:
+        """Release pooled HTTP connections to the HARPA nodes."""
+        await self.bridge.aclose()
+
+    async def __aenter__(self) -> "DToolsCloudClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def _cached_execute(self, command: str, params: dict, ttl: float) -> dict:
+        """bridge.execute for read commands, reusing a result younger than ttl."""
+        key = (command, tuple(sorted(params.items())))
+        hit = self._cache.get(key)
+        if hit is not None and hit[1] < ttl:
+            return hit[0]
+        result = await self.bridge.execute(command, params)
+        if not result.get("error"):
+            self._cache.set(key, result)
+        return result
+
+    def _invalidate_project(self, project_id: Optional[str] = None) -> None:
+        """Forget cached searches (and the project's details) after a mutation."""
+        self._cache.discard(
+            lambda key: key[0] == "search_projects"
+            or (key[0] == "get_project_status" and ("project_id", project_id) in key[1])
+        )
+
     # ------------------------------------------------------------------
     # Session Management
     # ------------------------------------------------------------------
@@ -294,21 +484,59 @@ class DToolsCloudClient:
         Returns:
             True if session is valid, False if expired/unreachable
         """
-        try:
-            await self.bridge.execute("search_projects", {"query": "__session_check__"})
-            logger.debug("D-Tools session check: OK")
+        if time.monotonic() < self._session_ok_until:
             return True
-        except DTSessionExpired as e:
-            logger.error("D-Tools session expired: %s", e)
-            if self._notify_hook:
-                await self._notify_hook(
-                    "⚠️ D-Tools Cloud session expired. Please re-login on Maestro or Stagehand "
-                    "(open Chrome → portal.d-tools.com → log in)."
-                )
-            return False
-        except HARPANodeUnavailable:
-            logger.error("HARPA nodes unreachable during session check")
-            return False
+        # One real probe at a time; concurrent callers reuse its outcome
+        async with self._session_lock:
+            if time.monotonic() < self._session_ok_until:
+                return True
+            try:
+                await self._probe_session()
+                logger.debug("D-Tools session check: OK")
+                self._session_ok_until = time.monotonic() + SESSION_OK_TTL
+                return True
+            except DTSessionExpired as e:
+                self._session_ok_until = 0.0
+                logger.error("D-Tools session expired: %s", e)
+                if self._notify_hook:
+                    await self._notify_hook(
+                        "⚠️ D-Tools Cloud session expired. Please re-login on Maestro or Stagehand "
+                        "(open Chrome → portal.d-tools.com → log in)."
+                    )
+                return False
+            except HARPANodeUnavailable:
+                logger.error("HARPA nodes unreachable during session check")
+                return False
+
+    async def _probe_session(self) -> None:
+        """
+        Ask the bridge for login state via the lightweight session_status command.
+        Bridges without it get the old search_projects probe (which drives the DOM).
+
+        Raises:
+            DTSessionExpired: If the browser is logged out
+        """
+        if self._session_status_supported is not False:
+            try:
+                result = await self.bridge.execute("session_status", {})
+            except DTException as e:
+                if "unknown command" not in str(e).lower():
+                    raise
+                result = {"error": str(e)}
+            error = str(result.get("error") or "")
+            if not error:
+                self._session_status_supported = True
+                if result.get("logged_in") is False:
+                    raise DTSessionExpired("D-Tools browser session is logged out (session_status)")
+                if result.get("logged_in") is True:
+                    return
+            elif "unknown command" in error.lower():
+                logger.info("HARPA bridge has no session_status command; falling back to search probe")
+                self._session_status_supported = False
+            else:
+                # Transient bridge error — not evidence of a logout; confirm with the search probe
+                logger.warning("session_status failed (%s); falling back to search probe", error)
+        await self.bridge.execute("search_projects", {"query": "__session_check__"})
 
     # ------------------------------------------------------------------
     # Project Management
@@ -342,6 +570,7 @@ class DToolsCloudClient:
             "address": address,
         })
 
+        self._invalidate_project()
         project_id = result.get("project_id")
         if not project_id:
             raise DTException(f"create_project returned no project_id: {result}")
@@ -362,7 +591,9 @@ class DToolsCloudClient:
         Raises:
             DTProjectNotFound: If project ID doesn't exist
         """
-        result = await self.bridge.execute("get_project_status", {"project_id": project_id})
+        result = await self._cached_execute(
+            "get_project_status", {"project_id": project_id}, CACHE_TTL_GET_PROJECT
+        )
 
         if result.get("error", "").lower() == "not found":
             raise DTProjectNotFound(f"Project {project_id} not found in D-Tools Cloud")
@@ -375,7 +606,7 @@ class DToolsCloudClient:
             phase=result.get("phase", "Proposal"),
             created_date=result.get("created_date", ""),
             last_updated=result.get("last_updated", ""),
-            rooms=result.get("rooms", []),
+            rooms=list(result.get("rooms", [])),
             equipment_count=result.get("equipment_count", 0),
         )
 
@@ -390,8 +621,8 @@ class DToolsCloudClient:
             List of dicts: [{project_id, name, client, phase}]
         """
         logger.debug("Searching D-Tools projects: '%s'", query)
-        result = await self.bridge.execute("search_projects", {"query": query})
-        return result.get("projects", [])
+        result = await self._cached_execute("search_projects", {"query": query}, CACHE_TTL_SEARCH_PROJECTS)
+        return list(result.get("projects", []))
 
     async def update_project_phase(self, project_id: str, new_phase: str) -> bool:
         """
@@ -417,6 +648,7 @@ class DToolsCloudClient:
             "project_id": project_id,
             "new_phase": new_phase,
         })
+        self._invalidate_project(project_id)
 
         success = result.get("success", False)
         if not success:
@@ -466,6 +698,7 @@ class DToolsCloudClient:
             "project_id": project_id,
             "csv_content": csv_content,
         })
+        self._invalidate_project(project_id)
 
         if not result.get("success", False):
             raise DTImportError(f"D-Tools equipment import failed: {result}")
@@ -507,6 +740,7 @@ class DToolsCloudClient:
             "project_id": project_id,
             "csv_content": csv_content,
         })
+        self._invalidate_project(project_id)
 
         if not result.get("success", False):
             raise DTImportError(f"D-Tools CSV import failed: {result}")
@@ -560,10 +794,10 @@ class DToolsCloudClient:
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        async with httpx.AsyncClient(timeout=120.0) as http:
-            resp = await http.get(download_url)
-            resp.raise_for_status()
-            output_path.write_bytes(resp.content)
+        http = await self.bridge._get_client()
+        resp = await http.get(download_url, timeout=DOWNLOAD_TIMEOUT)
+        resp.raise_for_status()
+        output_path.write_bytes(resp.content)
 
         logger.info("Proposal PDF downloaded: %s (%d bytes)", output_path, len(resp.content))
         return output_path
@@ -701,8 +935,8 @@ class DToolsCloudClient:
             params["category"] = category
 
         try:
-            result = await self.bridge.execute("search_catalog", params)
-            return result.get("products", [])
+            result = await self._cached_execute("search_catalog", params, CACHE_TTL_SEARCH_CATALOG)
+            return list(result.get("products", []))
         except Exception as e:
             logger.warning("Catalog search failed for '%s': %s", query, e)
             return []
@@ -802,22 +1036,21 @@ async def _smoke_test() -> None:
     """Quick smoke test for development — requires HARPA bridge running."""
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
 
-    client = get_dtools_client()
-
-    # Check HARPA node health
-    health = await client.bridge.health_check()
-    for node, ok in health.items():
-        status = "✓ online" if ok else "✗ offline"
-        print(f"  HARPA node {node}: {status}")
-
-    # Check D-Tools session
-    session_ok = await client.check_session()
-    print(f"  D-Tools session: {'✓ active' if session_ok else '✗ expired'}")
-
-    if session_ok:
-        # Search for test project
-        results = await client.search_projects("test")
-        print(f"  Search 'test': {len(results)} project(s) found")
+    async with get_dtools_client() as client:
+        # Check HARPA node health
+        health = await client.bridge.health_check()
+        for node, ok in health.items():
+            status = "✓ online" if ok else "✗ offline"
+            print(f"  HARPA node {node}: {status}")
+
+        # Check D-Tools session
+        session_ok = await client.check_session()
+        print(f"  D-Tools session: {'✓ active' if session_ok else '✗ expired'}")
+
+        if session_ok:
+            # Search for test project
+            results = await client.search_projects("test")
+            print(f"  Search 'test': {len(results)} project(s) found")
 
 
 if __name__ == "__main__":